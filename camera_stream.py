@@ -1,4 +1,18 @@
 import atexit
+import hashlib
+import math
+import multiprocessing as mp
+import os
+import struct
+from multiprocessing import shared_memory
+
+# Low-latency RTSP demuxing. Must be set before OpenCV opens any FFmpeg capture;
+# setdefault keeps an operator-provided value.
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|probesize;32|analyzeduration;0|max_delay;0",
+)
+
 import cv2
 import numpy as np
 from datetime import datetime
@@ -6,12 +20,74 @@ import threading
 from typing import Dict, Optional, Union
 import time
 
+try:
+    import simplejpeg
+except ImportError:  # optional: falls back to cv2.imencode
+    simplejpeg = None
+
+try:
+    import nvjpeg
+except ImportError:  # optional: GPU JPEG encode for RTSP streams
+    nvjpeg = None
+
+try:
+    import numba
+except ImportError:  # optional: falls back to cv2.randu + np.add
+    numba = None
+
 # Helps stability with OpenCV in threaded apps
 try:
     cv2.setNumThreads(1)
 except Exception:
     pass
 
+# Offload the downscale of large RTSP frames to the GPU/iGPU via the T-API when
+# an OpenCL device is present; plain CPU resize otherwise.
+try:
+    _USE_OPENCL = cv2.ocl.haveOpenCL()
+    cv2.ocl.setUseOpenCL(_USE_OPENCL)
+    _USE_OPENCL = _USE_OPENCL and cv2.ocl.useOpenCL()
+except Exception:
+    _USE_OPENCL = False
+
+
+def _resize(frame, size):
+    if _USE_OPENCL:
+        return cv2.resize(cv2.UMat(frame), size).get()
+    return cv2.resize(frame, size)
+
+
+def _encode_jpeg(frame, quality: int) -> Optional[bytes]:
+    # simplejpeg goes straight to libjpeg-turbo; cv2 is the fallback
+    if simplejpeg is not None:
+        try:
+            return simplejpeg.encode_jpeg(frame, quality=quality, colorspace="BGR", fastdct=True)
+        except Exception:
+            pass
+    ret, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes() if ret else None
+
+
+if numba is not None:
+    # serial on purpose: every simulator calls this from its own thread at once,
+    # and numba's default workqueue layer aborts on concurrent parallel launches.
+    # nogil lets those threads run it side by side instead.
+    @numba.njit(nogil=True, cache=True)
+    def _synth(buf, grad, seed):
+        # noise in [20, 80) + row gradient in one fused pass; xorshift32 seeded per row
+        h, w, c = buf.shape
+        for y in range(h):
+            x32 = numba.uint32(seed ^ ((y + 1) * 0x9E3779B9)) | numba.uint32(1)
+            g = grad[y, 0, 0]
+            for x in range(w):
+                for ch in range(c):
+                    x32 ^= numba.uint32(x32 << 13)
+                    x32 ^= x32 >> 17
+                    x32 ^= numba.uint32(x32 << 5)
+                    buf[y, x, ch] = 20 + (x32 % 60) + g
+else:
+    _synth = None
+
 
 class CameraSimulator:
     def __init__(self, room_name: str):
@@ -19,9 +95,18 @@ class CameraSimulator:
         self._stop = threading.Event()
         self._lock = threading.Lock()
         self.frame = None
+        self.jpeg_bytes: Optional[bytes] = None
         self.thread: Optional[threading.Thread] = None
         self.last_frame_ts: float = 0.0
 
+        # overlay timestamp only changes once per second
+        self._ts_sec = 0
+        self._ts_str = ""
+
+        # preallocated so the loop doesn't churn ~1MB of temporaries per frame
+        self._grad = np.linspace(30, 100, 480).reshape(480, 1, 1).astype(np.uint8)
+        self._buf = np.empty((480, 640, 3), dtype=np.uint8)
+
     def start(self):
         if self.thread and self.thread.is_alive():
             return
@@ -41,18 +126,26 @@ class CameraSimulator:
         self.thread = None
 
     def _generate_frames(self):
+        # deadline pacing: frame work is absorbed into the period instead of added to it
+        period = 1.0 / 30
+        next_t = time.monotonic() + period
         while not self._stop.is_set():
-            frame = np.random.randint(20, 80, (480, 640, 3), dtype=np.uint8)
-
-            gradient = np.linspace(30, 100, 480).reshape(480, 1)
-            frame = frame + gradient[:, :, np.newaxis].astype(np.uint8)
-            frame = np.clip(frame, 0, 255)
+            frame = self._buf
+            if _synth is not None:
+                _synth(frame, self._grad, np.uint32(time.monotonic_ns() & 0xFFFFFFFF))
+            else:
+                cv2.randu(frame, (20, 20, 20), (80, 80, 80))
+                # noise < 80 + gradient <= 100 never overflows uint8, so no clip needed
+                np.add(frame, self._grad, out=frame)
 
             cv2.putText(frame, f"Room: {self.room_name}", (10, 30),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
 
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cv2.putText(frame, timestamp, (10, 460),
+            now_s = int(time.time())
+            if now_s != self._ts_sec:
+                self._ts_sec = now_s
+                self._ts_str = datetime.fromtimestamp(now_s).strftime("%Y-%m-%d %H:%M:%S")
+            cv2.putText(frame, self._ts_str, (10, 460),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
 
             bed_color = (80, 120, 180)
@@ -60,24 +153,33 @@ class CameraSimulator:
             cv2.putText(frame, "BED", (280, 300),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
 
+            # encode once here so every viewer shares the same bytes
+            jpeg = _encode_jpeg(frame, 80)
+
             with self._lock:
                 self.frame = frame
+                self.jpeg_bytes = jpeg
                 self.last_frame_ts = time.time()
 
-            time.sleep(0.033)
+            now = time.monotonic()
+            sleep_for = next_t - now
+            if sleep_for > 0:
+                self._stop.wait(sleep_for)
+            else:
+                next_t = now
+            next_t += period
 
     def has_frame(self) -> bool:
         with self._lock:
-            return self.frame is not None
+            return self.jpeg_bytes is not None
 
-    def get_frame(self):
+    def get_frame(self) -> Optional[bytes]:
         with self._lock:
-            if self.frame is None:
-                return None
-            frame = self.frame.copy()
+            return self.jpeg_bytes
+
 
-        ret, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        return buffer.tobytes() if ret else None
+# fraction of frame_interval a frame may arrive early and still be decoded
+FRAME_SLACK = 0.2
 
 
 class RealCameraStream:
@@ -91,11 +193,47 @@ class RealCameraStream:
 
         self.cap: Optional[cv2.VideoCapture] = None
         self.frame = None
+        self.jpeg_bytes: Optional[bytes] = None
         self.thread: Optional[threading.Thread] = None
 
         self.reconnect_delay = 3
+        self.frame_interval = 1.0 / 30
         self.last_frame_ts: float = 0.0
 
+        # LIVE pulse brightness, refreshed every 3rd frame (~10 Hz)
+        self._pulse_tick = 0
+        self._last_pulse = 0
+
+        # overlay timestamp only changes once per second
+        self._ts_sec = 0
+        self._ts_str = ""
+
+        # "Room: ..." never changes, so rasterize it once and blit the pixels;
+        # the 316x76 box is widened for names that don't fit in it
+        self._label_text = f"Room: {self.room_name}"
+        (text_w, _), _ = cv2.getTextSize(self._label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+        self._label = np.zeros((76, max(316, text_w + 10), 3), dtype=np.uint8)
+        cv2.putText(self._label, self._label_text, (5, 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        self._label_mask = self._label.any(axis=2)[:, :, np.newaxis]
+
+        # NVJPEG takes BGR directly; any failure drops back to the CPU encoders
+        self._hw_enc = None
+        if nvjpeg is not None:
+            try:
+                self._hw_enc = nvjpeg.NvJpeg()
+            except Exception as e:
+                print(f"[Camera] NVJPEG unavailable for {self.room_name}: {e}")
+
+    def _encode(self, frame) -> Optional[bytes]:
+        if self._hw_enc is not None:
+            try:
+                return self._hw_enc.encode(frame, 85)
+            except Exception as e:
+                print(f"[Camera] NVJPEG encode failed for {self.room_name}, using CPU: {e}")
+                self._hw_enc = None
+        return _encode_jpeg(frame, 85)
+
     def start(self):
         if self.thread and self.thread.is_alive():
             return
@@ -130,7 +268,12 @@ class RealCameraStream:
             try:
                 print(f"[Camera] Connecting to {self.room_name}: {self.rtsp_url}")
 
-                cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+                try:
+                    # open timeout only takes effect when passed at open time
+                    cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG,
+                                           [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 5000])
+                except Exception:
+                    cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
                 try:
                     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 except Exception:
@@ -151,8 +294,25 @@ class RealCameraStream:
 
                 print(f"[Camera] Connected to {self.room_name}")
 
+                interval = self.frame_interval
+                # frames that arrive a little early still count; otherwise jitter
+                # on a camera running at exactly 1/interval drops every other one
+                slack = FRAME_SLACK * interval
+                next_retrieve = 0.0
                 while not self._stop.is_set():
-                    ret, frame = cap.read()
+                    # grab() only demuxes; decode (retrieve) just the newest frame
+                    # once per interval so queued frames are dropped, not shown late
+                    if not cap.grab():
+                        print(f"[Camera] Lost connection to {self.room_name}")
+                        break
+
+                    now = time.monotonic()
+                    if now < next_retrieve - slack:
+                        continue
+                    # step along a fixed deadline grid; after a stall, resync to now
+                    next_retrieve = max(next_retrieve + interval, now)
+
+                    ret, frame = cap.retrieve()
                     if not ret or frame is None:
                         print(f"[Camera] Lost connection to {self.room_name}")
                         break
@@ -160,31 +320,36 @@ class RealCameraStream:
                     h, w = frame.shape[:2]
                     if w > 1280:
                         scale = 1280 / w
-                        frame = cv2.resize(frame, (1280, int(h * scale)))
-
-                    overlay = frame.copy()
-                    cv2.rectangle(overlay, (5, 5), (320, 80), (0, 0, 0), -1)
-                    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
-
-                    cv2.putText(frame, f"Room: {self.room_name}", (10, 30),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                        frame = _resize(frame, (1280, int(h * scale)))
 
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     hh, ww = frame.shape[:2]
-                    cv2.rectangle(frame, (5, hh - 35), (260, hh - 5), (0, 0, 0), -1)
-                    cv2.putText(frame, timestamp, (10, hh - 15),
+                    label_w = self._label.shape[1]
+                    if hh >= 81 and ww >= 5 + label_w:
+                        # 50% black box: halve the ROI in place instead of blending a full-frame copy
+                        roi = frame[5:81, 5:5 + label_w]
+                        roi >>= 1
+                        np.copyto(roi, self._label, where=self._label_mask)
+                    else:
+                        # frame too small for the pre-rendered label; draw it directly
+                        cv2.putText(frame, self._label_text, (10, 30),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+                    now_s = int(time.time())
+                    if now_s != self._ts_sec:
+                        self._ts_sec = now_s
+                        self._ts_str = datetime.fromtimestamp(now_s).strftime("%Y-%m-%d %H:%M:%S")
+                    frame[hh - 35:hh - 4, 5:261] = 0
+                    cv2.putText(frame, self._ts_str, (10, hh - 15),
                                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
-                    pulse = int(abs(np.sin(time.time() * 3) * 255))
-                    cv2.circle(frame, (ww - 40, 30), 12, (0, pulse, 0), -1)
+                    self._pulse_tick += 1
+                    if self._pulse_tick % 3 == 0:
+                        self._last_pulse = int(abs(math.sin(time.time() * 3) * 255))
+                    cv2.circle(frame, (ww - 40, 30), 12, (0, self._last_pulse, 0), -1)
                     cv2.putText(frame, "LIVE", (ww - 85, 35),
                                 cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
 
-                    with self._frame_lock:
-                        self.frame = frame
-                        self.last_frame_ts = time.time()
-
-                    time.sleep(0.005)
+                    self._publish(frame, self._encode(frame))
 
             except Exception as e:
                 print(f"[Camera] Error in {self.room_name}: {str(e)}")
@@ -202,27 +367,256 @@ class RealCameraStream:
                 if not self._stop.is_set():
                     time.sleep(self.reconnect_delay)
 
+    def _publish(self, frame, jpeg: Optional[bytes]):
+        with self._frame_lock:
+            self.frame = frame
+            self.jpeg_bytes = jpeg
+            self.last_frame_ts = time.time()
+
     def has_frame(self) -> bool:
         with self._frame_lock:
             return self.frame is not None
 
-    def get_frame(self):
+    def get_frame(self) -> Optional[bytes]:
         with self._frame_lock:
-            if self.frame is None:
+            return self.jpeg_bytes
+
+
+# ----------------- Process-per-camera -----------------
+
+# shm slot layout: [seq:uint32][length:uint32][ts:float64][jpeg bytes...]
+# seq is 0 before the first frame, odd while the publisher is writing and even
+# once a frame is complete, so readers without the lock can spot torn reads.
+_SHM_HEADER = struct.Struct("<IId")
+_SHM_SIZE = 4 * 1024 * 1024
+# longest get_frame() will block the caller waiting for a publisher
+FRAME_LOCK_TIMEOUT = 0.02
+
+
+def _shm_name(namespace: str, room_name: str) -> str:
+    # room names can hold spaces/unicode; POSIX shm names can't.
+    # The namespace keeps separate server instances on one host apart.
+    digest = hashlib.sha1(room_name.encode("utf-8")).hexdigest()[:16]
+    return f"l7700cam_{namespace}_{digest}"
+
+
+class _SharedMemoryPublisher(RealCameraStream):
+    """RealCameraStream that publishes JPEGs into a SharedMemory slot."""
+
+    def __init__(self, rtsp_url: str, room_name: str, shm, lock, stop_event):
+        super().__init__(rtsp_url, room_name)
+        self._shm = shm
+        self._shm_lock = lock
+        self._stop = stop_event
+        self._seq = 0
+
+    def _publish(self, frame, jpeg: Optional[bytes]):
+        if not jpeg or len(jpeg) > _SHM_SIZE - _SHM_HEADER.size:
+            return
+        self._seq = (self._seq + 2) & 0xFFFFFFFF or 2
+        buf = self._shm.buf
+        with self._shm_lock:
+            struct.pack_into("<I", buf, 0, self._seq - 1)
+            buf[_SHM_HEADER.size:_SHM_HEADER.size + len(jpeg)] = jpeg
+            _SHM_HEADER.pack_into(buf, 0, self._seq, len(jpeg), time.time())
+
+
+def _camera_worker(rtsp_url: str, room_name: str, shm_name: str, lock, stop_event):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _SharedMemoryPublisher(rtsp_url, room_name, shm, lock, stop_event)._capture_frames()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shm.close()
+
+
+class ProcessCameraStream:
+    """Runs RealCameraStream capture/overlay/encode in its own process (no GIL sharing)."""
+
+    def __init__(self, rtsp_url: str, room_name: str, shm_name: Optional[str] = None):
+        self.rtsp_url = rtsp_url
+        self.room_name = (room_name or "").strip()
+        self.shm_name = shm_name or _shm_name(str(os.getpid()), self.room_name)
+
+        # spawn: forking a threaded server process is unsafe
+        self._ctx = mp.get_context("spawn")
+        self._lock = self._ctx.Lock()
+        self._stop = self._ctx.Event()
+        self.process: Optional[mp.process.BaseProcess] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+        # last bytes read back; reused while the worker hasn't published a new frame
+        self._seq = 0
+        self._jpeg: Optional[bytes] = None
+
+    @property
+    def last_frame_ts(self) -> float:
+        if self._shm is None:
+            return 0.0
+        return _SHM_HEADER.unpack_from(self._shm.buf, 0)[2]
+
+    def _create_shm(self) -> shared_memory.SharedMemory:
+        name = self.shm_name
+        try:
+            return shared_memory.SharedMemory(name=name, create=True, size=_SHM_SIZE)
+        except FileExistsError:
+            # left behind by an earlier run that didn't shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            return shared_memory.SharedMemory(name=name, create=True, size=_SHM_SIZE)
+
+    def start(self):
+        if self.process and self.process.is_alive():
+            return
+        if self._shm is None:
+            self._shm = self._create_shm()
+        _SHM_HEADER.pack_into(self._shm.buf, 0, 0, 0, 0.0)
+        self._seq = 0
+        self._jpeg = None
+
+        self._stop.clear()
+        self.process = self._ctx.Process(
+            target=_camera_worker,
+            args=(self.rtsp_url, self.room_name, self._shm.name, self._lock, self._stop),
+            name=f"RTSP-{self.room_name}",
+            daemon=True
+        )
+        self.process.start()
+
+    def stop(self):
+        self._stop.set()
+
+        p = self.process
+        if p:
+            p.join(timeout=2.5)
+            if p.is_alive():
+                p.terminate()
+                p.join(timeout=1.0)
+        self.process = None
+
+        if self._shm is not None:
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception:
+                pass
+            self._shm = None
+
+    def has_frame(self) -> bool:
+        if self._shm is None:
+            return False
+        return _SHM_HEADER.unpack_from(self._shm.buf, 0)[0] > 1
+
+    def get_frame(self) -> Optional[bytes]:
+        shm = self._shm
+        if shm is None:
+            return None
+        # called from the event loop: never wait long on the cross-process lock,
+        # serve the previous frame if the worker is mid-write or died holding it
+        if not self._lock.acquire(timeout=FRAME_LOCK_TIMEOUT):
+            return self._jpeg
+        try:
+            seq, length, _ = _SHM_HEADER.unpack_from(shm.buf, 0)
+            if seq == 0:
                 return None
-            frame = self.frame.copy()
+            if seq != self._seq:
+                self._jpeg = bytes(shm.buf[_SHM_HEADER.size:_SHM_HEADER.size + length])
+                self._seq = seq
+            return self._jpeg
+        finally:
+            self._lock.release()
+
+
+class SharedMemoryCameraReader:
+    """
+    Serves the frames another process's ProcessCameraStream publishes, without
+    opening an RTSP session of its own. It can't share that stream's lock, so
+    it checks seq before and after copying instead and keeps the last good
+    frame when the publisher was mid-write.
+    """
+
+    REOPEN_INTERVAL = 1.0
+    # a segment this quiet may have been recreated by a restarted owner
+    STALE_AFTER = 5.0
+
+    def __init__(self, room_name: str, shm_name: str):
+        self.room_name = (room_name or "").strip()
+        self.shm_name = shm_name
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._retry_at = 0.0
+        self._seq = 0
+        self._jpeg: Optional[bytes] = None
+
+    @property
+    def last_frame_ts(self) -> float:
+        if self._shm is None:
+            return 0.0
+        return _SHM_HEADER.unpack_from(self._shm.buf, 0)[2]
+
+    def _segment(self) -> Optional[shared_memory.SharedMemory]:
+        # the owner may not have created it yet, or may have restarted since
+        now = time.monotonic()
+        if now >= self._retry_at and (self._shm is None or time.time() - self.last_frame_ts > self.STALE_AFTER):
+            self._retry_at = now + self.REOPEN_INTERVAL
+            self.stop()
+            try:
+                self._shm = shared_memory.SharedMemory(name=self.shm_name)
+            except FileNotFoundError:
+                self._shm = None
+        return self._shm
 
-        ret, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        return buffer.tobytes() if ret else None
+    def start(self):
+        self._segment()
+
+    def stop(self):
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except Exception:
+                pass
+            self._shm = None
+        self._seq = 0
+
+    def has_frame(self) -> bool:
+        shm = self._segment()
+        return shm is not None and _SHM_HEADER.unpack_from(shm.buf, 0)[0] > 1
+
+    def get_frame(self) -> Optional[bytes]:
+        shm = self._segment()
+        if shm is None:
+            return self._jpeg
+        buf = shm.buf
+        seq, length, _ = _SHM_HEADER.unpack_from(buf, 0)
+        if seq & 1 or seq == 0 or seq == self._seq or length > _SHM_SIZE - _SHM_HEADER.size:
+            return self._jpeg
+        jpeg = bytes(buf[_SHM_HEADER.size:_SHM_HEADER.size + length])
+        if _SHM_HEADER.unpack_from(buf, 0)[0] != seq:
+            return self._jpeg
+        self._seq = seq
+        self._jpeg = jpeg
+        return jpeg
 
 
-StreamType = Union[CameraSimulator, RealCameraStream]
+StreamType = Union[CameraSimulator, RealCameraStream, ProcessCameraStream, SharedMemoryCameraReader]
 
 
 class CameraManager:
-    def __init__(self, use_simulation=True):
+    def __init__(self, use_simulation=True, use_processes=True, shm_namespace: Optional[str] = None):
+        # copy-on-write: writers swap in a new dict under _lock, readers use
+        # whatever dict is current without locking
         self.cameras: Dict[str, StreamType] = {}
         self.use_simulation = use_simulation
+        # real RTSP cameras run in a worker process each unless disabled
+        self.use_processes = use_processes
+        # readers in other processes find the camera processes' frames by
+        # namespace + room; see attach_only
+        self.shm_namespace = shm_namespace or str(os.getpid())
+        # set when another process with the same namespace owns the RTSP
+        # cameras: real cameras are then read from its shared memory instead
+        # of being opened again
+        self.attach_only = False
         self._lock = threading.Lock()
         atexit.register(self.shutdown)
 
@@ -242,39 +636,42 @@ class CameraManager:
             else:
                 if not rtsp_url:
                     raise ValueError(f"RTSP URL required for {key}")
-                cam = RealCameraStream(rtsp_url, key)
+                shm_name = _shm_name(self.shm_namespace, key)
+                if self.attach_only:
+                    cam = SharedMemoryCameraReader(key, shm_name)
+                elif self.use_processes:
+                    cam = ProcessCameraStream(rtsp_url, key, shm_name)
+                else:
+                    cam = RealCameraStream(rtsp_url, key)
 
             cam.start()
-            self.cameras[key] = cam
+            self.cameras = {**self.cameras, key: cam}
             print(f"[Camera] Added camera for {key}")
 
     def remove_camera(self, room_name: str):
         key = self._key(room_name)
         with self._lock:
-            cam = self.cameras.pop(key, None)
+            cameras = dict(self.cameras)
+            cam = cameras.pop(key, None)
+            self.cameras = cameras
         if cam:
             cam.stop()
 
     def get_frame(self, room_name: str):
-        key = self._key(room_name)
-        with self._lock:
-            cam = self.cameras.get(key)
+        cam = self.cameras.get(self._key(room_name))
         return cam.get_frame() if cam else None
 
     def has_frame(self, room_name: str) -> bool:
-        key = self._key(room_name)
-        with self._lock:
-            cam = self.cameras.get(key)
+        cam = self.cameras.get(self._key(room_name))
         return cam.has_frame() if cam else False
 
     def get_all_rooms(self):
-        with self._lock:
-            return list(self.cameras.keys())
+        return list(self.cameras.keys())
 
     def shutdown(self):
         with self._lock:
             cams = list(self.cameras.values())
-            self.cameras.clear()
+            self.cameras = {}
         for cam in cams:
             try:
                 cam.stop()
@@ -25,6 +25,11 @@ class Config:
     else:
         DATABASE_URL = f"mysql+pymysql://{DB_USER}:{_pwd}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 
+    # connection pool (UDP writer + API requests + websocket reconnects share it)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
     # ---------- UDP ----------
     UDP_IP = os.getenv("UDP_IP", "0.0.0.0")
     UDP_PORT = int(os.getenv("UDP_PORT", "6345"))  # set default to what your server log shows
@@ -32,6 +37,12 @@ class Config:
     # ---------- SERVER ----------
     SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
     SERVER_PORT = int(os.getenv("SERVER_PORT", "9000"))
+    # uvicorn worker processes; more than one needs REDIS_URL for websocket fan-out
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+    REDIS_URL = os.getenv("REDIS_URL", "")
+
+    # 1 = re-read page templates on every request (development only)
+    DEBUG = os.getenv("DEBUG", "0") == "1"
 
     # ---------- TIMEZONE ----------
     TIMEZONE = "Asia/Karachi"
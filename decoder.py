@@ -1,12 +1,83 @@
 import re
-from typing import Optional, Dict
+import struct
+from sys import intern
+from typing import NamedTuple, Optional, Dict, List, Tuple
+
+UNKNOWN = intern("UNKNOWN")
+DEVICE_INTERCALL = intern("INTERCALL-IP")
+# Canonical spelling. Known event words (in any case) are decoded to their
+# EVENT_CANDIDATES entry, so callers compare with == instead of lower()-ing
+# every packet; an unrecognized INTERCALL-IP word passes through as sent.
+EVENT_RESET = intern("Reset")
+
+_BED_NO_RE = re.compile(r"\b(BED|Bed)\s*(No\.?|NO\.?|#)?\s*[-:]?\s*(\d{1,4})\b", flags=re.IGNORECASE)
+_BED_LABEL_RE = re.compile(r"\b([A-Za-z0-9\s\-]{1,40}BED\s*[-:]?\s*\d{1,4})\b", flags=re.IGNORECASE)
+_ROOM_RE = re.compile(r"\b([A-Za-z0-9\s\-]{1,40}(ROOM|RM)\s*\d{0,4})\b", flags=re.IGNORECASE)
+_ROOM_ALT_RE = re.compile(r"([A-Za-z0-9\-\s]{5,40})")
+_DEVICE_ALT_RE = re.compile(r"([A-Z0-9\-\_]{6,20})")
+
+# Checked in priority order: the first candidate present anywhere in the payload wins.
+EVENT_CANDIDATES: Tuple[str, ...] = tuple(intern(c) for c in (
+    "Call", "Accept", "Cancel", "Presence", EVENT_RESET, "ROOM SERVICE", "Doctor Present",
+    "Present", "CATERING SERVICE", "Alarm", "Assistance", "LowBattery", "Emergency", "Isolate"
+))
+_EVENT_PRIORITY: Dict[str, int] = {c.lower(): i for i, c in enumerate(EVENT_CANDIDATES)}
+
+# One case-insensitive pass over the payload instead of one lower()+`in` per candidate.
+# The zero-width lookahead reports a hit at every position (overlaps included), and at a
+# given position the alternation tries candidates in priority order.
+_EVENT_RE = re.compile(
+    "(?=(" + "|".join(re.escape(c) for c in EVENT_CANDIDATES) + "))",
+    flags=re.IGNORECASE,
+)
+
+def _match_event(ascii_payload: str) -> str:
+    best = len(EVENT_CANDIDATES)
+    for m in _EVENT_RE.finditer(ascii_payload):
+        i = _EVENT_PRIORITY[m.group(1).lower()]
+        if i < best:
+            best = i
+            if i == 0:
+                break
+    return EVENT_CANDIDATES[best] if best < len(EVENT_CANDIDATES) else UNKNOWN
+
+
+class DecodedPacket(NamedTuple):
+    timestamp: str
+
+    # UI title (big text)
+    room: str
+
+    # UI subtitle (small text)
+    bed: str
+
+    # keep originals too (useful for DB / debugging)
+    bed_name: str
+    room_name: str
+
+    device: str
+    event: str
+    raw_hex: str
+
+_UNPACK_TS = struct.Struct("<6B").unpack_from
+# Devices send bursts within the same second; memoize the formatted string.
+_TS_CACHE: Dict[bytes, str] = {}
+_TS_CACHE_MAX = 4096
 
 def _parse_timestamp(ts_bytes: bytes) -> str:
     if len(ts_bytes) < 6:
         return "0000-00-00 00:00:00"
-    yy, mm, dd, hh, mi, ss = ts_bytes[0], ts_bytes[1], ts_bytes[2], ts_bytes[3], ts_bytes[4], ts_bytes[5]
+    key = bytes(ts_bytes[:6])
+    s = _TS_CACHE.get(key)
+    if s is not None:
+        return s
+    yy, mm, dd, hh, mi, ss = _UNPACK_TS(key)
     year = 2000 + yy if yy < 100 else yy
-    return f"{year:04}-{mm:02}-{dd:02} {hh:02}:{mi:02}:{ss:02}"
+    s = f"{year:04}-{mm:02}-{dd:02} {hh:02}:{mi:02}:{ss:02}"
+    if len(_TS_CACHE) >= _TS_CACHE_MAX:
+        _TS_CACHE.clear()
+    _TS_CACHE[key] = s
+    return s
 
 def _cleanup_ascii_block(s: str) -> str:
     return s.replace("\x00", "").strip()
@@ -18,17 +89,17 @@ def _extract_bed(ascii_payload: str) -> str:
     - 'BED 1', 'Bed-1', 'BED1'
     """
     # Bed No 1 style
-    m = re.search(r"\b(BED|Bed)\s*(No\.?|NO\.?|#)?\s*[-:]?\s*(\d{1,4})\b", ascii_payload, flags=re.IGNORECASE)
+    m = _BED_NO_RE.search(ascii_payload)
     if m:
         num = m.group(3)
         return f"Bed No {num}"
 
     # BED 12 style with possible extra text
-    m2 = re.search(r"\b([A-Za-z0-9\s\-]{1,40}BED\s*[-:]?\s*\d{1,4})\b", ascii_payload, flags=re.IGNORECASE)
+    m2 = _BED_LABEL_RE.search(ascii_payload)
     if m2:
         return _cleanup_ascii_block(m2.group(1))
 
-    return "UNKNOWN"
+    return UNKNOWN
 
 def _extract_room(ascii_payload: str) -> str:
     """
@@ -37,81 +108,81 @@ def _extract_room(ascii_payload: str) -> str:
     - 'RM 02'
     - fallback to first readable block
     """
-    room_match = re.search(r"\b([A-Za-z0-9\s\-]{1,40}(ROOM|RM)\s*\d{0,4})\b", ascii_payload, flags=re.IGNORECASE)
+    room_match = _ROOM_RE.search(ascii_payload)
     if room_match:
         return _cleanup_ascii_block(room_match.group(1))
 
-    alt_match = re.search(r"([A-Za-z0-9\-\s]{5,40})", ascii_payload)
+    alt_match = _ROOM_ALT_RE.search(ascii_payload)
     if alt_match:
         return _cleanup_ascii_block(alt_match.group(1))
 
-    return "UNKNOWN"
+    return UNKNOWN
 
-def decode_l7700_packet(data: bytes) -> Optional[Dict]:
+def decode_l7700_packet(data: bytes) -> Optional[DecodedPacket]:
     try:
-        if not data or data[0] != 0x02 or data[-1] != 0x03:
+        # STX + 24-byte header + ETX; reject before any slicing or decoding
+        if len(data) < 26 or data[0] != 0x02 or data[-1] != 0x03:
             return None
 
-        payload = data[1:-1]
-        if len(payload) < 24:
-            return None
+        timestamp = _parse_timestamp(data[17:23])
 
-        ts_block = payload[16:24]
-        timestamp = _parse_timestamp(ts_block)
+        # latin1 is byte-for-byte, so a bytes offset is also a str offset
+        dev_idx = data.find(b"INTERCALL-IP", 1, len(data) - 1)
+        if dev_idx != -1:
+            dev_idx -= 1
 
-        ascii_payload = payload.decode("latin1", "ignore")
+        # decode straight from a view of the payload, no intermediate bytes copy
+        ascii_payload = str(memoryview(data)[1:-1], "latin1", "ignore")
 
         bed = _extract_bed(ascii_payload)
         room = _extract_room(ascii_payload)
 
         # Device type
-        device = "UNKNOWN"
-        dev_idx = ascii_payload.find("INTERCALL-IP")
+        device = UNKNOWN
         if dev_idx != -1:
-            device = "INTERCALL-IP"
+            device = DEVICE_INTERCALL
         else:
-            dev_alt = re.search(r"([A-Z0-9\-\_]{6,20})", ascii_payload)
+            dev_alt = _DEVICE_ALT_RE.search(ascii_payload)
             if dev_alt:
                 device = _cleanup_ascii_block(dev_alt.group(1))
 
         # Event
-        event = "UNKNOWN"
+        event = UNKNOWN
         if dev_idx != -1:
-            start = dev_idx + len("INTERCALL-IP")
+            start = dev_idx + len(DEVICE_INTERCALL)
             event_block = ascii_payload[start:start + 32]
             event = _cleanup_ascii_block(event_block)
             if event:
-                event = event.split()[0]
+                word = event.split()[0]
+                i = _EVENT_PRIORITY.get(word.lower())
+                # event words repeat forever; share one str per distinct word
+                event = EVENT_CANDIDATES[i] if i is not None else intern(word)
         else:
-            for candidate in (
-                "Call", "Accept", "Cancel", "Presence", "Reset", "ROOM SERVICE", "Doctor Present",
-                "Present", "CATERING SERVICE", "Alarm", "Assistance", "LowBattery", "Emergency", "Isolate"
-            ):
-                if candidate.lower() in ascii_payload.lower():
-                    event = candidate
-                    break
+            event = _match_event(ascii_payload)
 
         # ✅ SWAP: title should show bed, subtitle should show room
         # If bed not found, fallback to room for title.
-        title = bed if bed != "UNKNOWN" else room
-        subtitle = room if bed != "UNKNOWN" else ""
-
-        return {
-            "timestamp": timestamp,
-
-            # UI title (big text)
-            "room": title.strip(),
-
-            # UI subtitle (small text)
-            "bed": subtitle.strip(),
-
-            # keep originals too (useful for DB / debugging)
-            "bed_name": bed.strip(),
-            "room_name": room.strip(),
-
-            "device": device.strip(),
-            "event": event.strip(),
-            "raw_hex": data.hex(),
-        }
+        title = bed if bed != UNKNOWN else room
+        subtitle = room if bed != UNKNOWN else ""
+
+        return DecodedPacket(
+            timestamp=timestamp,
+            room=title.strip(),
+            bed=subtitle.strip(),
+            bed_name=bed.strip(),
+            room_name=room.strip(),
+            device=device.strip(),
+            event=event.strip(),
+            raw_hex=data.hex(),
+        )
     except Exception:
         return None
+
+def decode_l7700_batch(packets: List[bytes]) -> List[Optional[DecodedPacket]]:
+    """
+    Decode a burst of datagrams in one call. The result is aligned with
+    `packets` (None where a packet is rejected) so callers can zip it back
+    with the sender addresses.
+    """
+    decode = decode_l7700_packet
+    return [decode(p) for p in packets]
@@ -18,12 +18,10 @@ DB_NAME = os.getenv("DB_NAME", "hospital_monitor")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-config = context.config
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
-
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
+config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
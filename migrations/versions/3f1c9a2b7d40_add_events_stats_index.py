@@ -0,0 +1,28 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "3f1c9a2b7d40"
+down_revision = "264110f95dd8"
+branch_labels = None
+depends_on = None
+
+def _index_exists(conn, table, index):
+    res = conn.execute(sa.text("""
+        SELECT COUNT(*) AS c
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = :t
+          AND INDEX_NAME = :i
+    """), {"t": table, "i": index}).scalar()
+    return int(res or 0) > 0
+
+def upgrade():
+    conn = op.get_bind()
+
+    if not _index_exists(conn, "events", "ix_events_created_status_type"):
+        op.create_index("ix_events_created_status_type", "events", ["created_at", "status", "event_type"])
+
+def downgrade():
+    conn = op.get_bind()
+    if _index_exists(conn, "events", "ix_events_created_status_type"):
+        op.drop_index("ix_events_created_status_type", table_name="events")
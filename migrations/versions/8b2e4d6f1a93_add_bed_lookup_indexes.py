@@ -0,0 +1,34 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "8b2e4d6f1a93"
+down_revision = "3f1c9a2b7d40"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_events_bed_created", "events", ["bed_id", "created_at"]),
+    ("ix_call_sessions_bed_status", "call_sessions", ["bed_id", "status"]),
+)
+
+def _index_exists(conn, table, index):
+    res = conn.execute(sa.text("""
+        SELECT COUNT(*) AS c
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = :t
+          AND INDEX_NAME = :i
+    """), {"t": table, "i": index}).scalar()
+    return int(res or 0) > 0
+
+def upgrade():
+    conn = op.get_bind()
+    for name, table, cols in INDEXES:
+        if not _index_exists(conn, table, name):
+            op.create_index(name, table, cols)
+
+def downgrade():
+    conn = op.get_bind()
+    for name, table, _ in reversed(INDEXES):
+        if _index_exists(conn, table, name):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,62 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c5d7e9f0b214"
+down_revision = "8b2e4d6f1a93"
+branch_labels = None
+depends_on = None
+
+def _column_exists(conn, table, column):
+    res = conn.execute(sa.text("""
+        SELECT COUNT(*) AS c
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = :t
+          AND COLUMN_NAME = :c
+    """), {"t": table, "c": column}).scalar()
+    return int(res or 0) > 0
+
+def _index_exists(conn, table, index):
+    res = conn.execute(sa.text("""
+        SELECT COUNT(*) AS c
+        FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = :t
+          AND INDEX_NAME = :i
+    """), {"t": table, "i": index}).scalar()
+    return int(res or 0) > 0
+
+def upgrade():
+    conn = op.get_bind()
+
+    # end duplicate active sessions (keep the newest per bed) so the unique key can be built
+    conn.execute(sa.text("""
+        UPDATE call_sessions cs
+        JOIN (
+            SELECT bed_id, MAX(id) AS keep_id
+            FROM call_sessions
+            WHERE status = 'active'
+            GROUP BY bed_id
+            HAVING COUNT(*) > 1
+        ) d ON cs.bed_id = d.bed_id
+        SET cs.status = 'ended', cs.ended_at = NOW()
+        WHERE cs.status = 'active' AND cs.id < d.keep_id
+    """))
+
+    if not _column_exists(conn, "call_sessions", "active_bed_id"):
+        op.add_column("call_sessions", sa.Column("active_bed_id", sa.Integer(), nullable=True))
+
+    conn.execute(sa.text("""
+        UPDATE call_sessions
+        SET active_bed_id = CASE WHEN status = 'active' THEN bed_id END
+    """))
+
+    if not _index_exists(conn, "call_sessions", "uk_call_sessions_active_bed"):
+        op.create_index("uk_call_sessions_active_bed", "call_sessions", ["active_bed_id"], unique=True)
+
+def downgrade():
+    conn = op.get_bind()
+    if _index_exists(conn, "call_sessions", "uk_call_sessions_active_bed"):
+        op.drop_index("uk_call_sessions_active_bed", table_name="call_sessions")
+    if _column_exists(conn, "call_sessions", "active_bed_id"):
+        op.drop_column("call_sessions", "active_bed_id")
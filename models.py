@@ -1,12 +1,12 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 Base = declarative_base()
 
 # Asia/Karachi timezone
-KARACHI_TZ = pytz.timezone('Asia/Karachi')
+KARACHI_TZ = ZoneInfo('Asia/Karachi')
 
 def get_karachi_time():
     return datetime.now(KARACHI_TZ)
@@ -105,8 +105,21 @@ class CallSession(Base):
     status = Column(String(20), default='active')
     created_at = Column(DateTime, default=get_karachi_time)
 
+    # bed_id while the session is active, NULL once it ends; the unique index
+    # on it allows at most one active session per bed (and any number of ended ones).
+    # Kept by the application: MySQL refuses a generated column over bed_id
+    # because of its ON DELETE CASCADE foreign key.
+    active_bed_id = Column(Integer, nullable=True)
+
     bed = relationship("Bed", foreign_keys=[bed_id])
 
+    __table_args__ = (
+        # no longer used for lookups (active sessions go through uk_call_sessions_active_bed),
+        # but it is the index InnoDB uses for the bed_id foreign key, so it can't simply be dropped
+        Index('ix_call_sessions_bed_status', 'bed_id', 'status'),
+        Index('uk_call_sessions_active_bed', 'active_bed_id', unique=True),
+    )
+
 class Event(Base):
     __tablename__ = 'events'
 
@@ -133,6 +146,13 @@ class Event(Base):
     bed = relationship("Bed", back_populates="events")
     call_session = relationship("CallSession", foreign_keys=[call_session_id])
 
+    __table_args__ = (
+        # /api/stats: one range scan on created_at, status/event_type read from the index
+        Index('ix_events_created_status_type', 'created_at', 'status', 'event_type'),
+        # per-bed history, newest first
+        Index('ix_events_bed_created', 'bed_id', 'created_at'),
+    )
+
 class ColorScheme(Base):
     __tablename__ = 'color_schemes'
 
@@ -152,19 +172,32 @@ class ColorScheme(Base):
 
 def get_db_engine(
     db_url="mysql+pymysql://root:@localhost/hospital_monitor",
-    socket_path="/opt/lampp/var/mysql/mysql.sock"
+    socket_path="/opt/lampp/var/mysql/mysql.sock",
+    pool_size=20,
+    max_overflow=20,
+    pool_recycle=1800,
 ):
+    # LIFO hands back the most recently used connection, so a small warm set
+    # serves normal load and the rest idle out; recycle stays under MySQL's wait_timeout
     return create_engine(
         db_url,
         echo=False,
         pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_use_lifo=True,
         connect_args={"unix_socket": socket_path},
     )
 
 
+# One factory for the whole process. expire_on_commit=False keeps loaded
+# attributes usable after commit instead of re-SELECTing them.
+SessionLocal = sessionmaker(expire_on_commit=False)
+
+
 def get_db_session(engine):
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return SessionLocal(bind=engine)
 
 def init_database(engine):
     Base.metadata.create_all(engine)
@@ -1,87 +1,288 @@
-import socket
 import asyncio
 import json
+import os
 import re
+import socket
+import threading
 import time
+import weakref
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import quote
 import base64
 
 import uvicorn
 import pymysql
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Response
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Response, Depends
 from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import joinedload
-from sqlalchemy import inspect
-
-from decoder import decode_l7700_packet
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import inspect, select, update, func, case, and_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional: only needed to fan out across several workers
+    aioredis = None
+
+from decoder import decode_l7700_batch, DecodedPacket, EVENT_RESET
 from camera_stream import CameraManager
 from config import Config
 from models import (
-    get_db_engine, get_db_session, init_database,
+    get_db_engine, SessionLocal, init_database,
     Floor, Ward, Room, Bed, Camera, Event, ColorScheme, CallSession,
     get_karachi_time
 )
 
-# ----------------- Globals -----------------
+# ----------------- Room cache -----------------
 
-engine = get_db_engine(Config.DATABASE_URL)
-camera_manager = CameraManager(use_simulation=False)
-active_connections = {}  # ws clients
+_NUM_RE = re.compile(r"\b\d+\b")
+# \w is exactly str.isalnum() plus "_", so this strips what the old
+# per-character isalnum() filter dropped, in one C-level pass
+_NORM_RE = re.compile(r"[\W_]+")
 
 
-# ----------------- Helpers -----------------
-
 def _norm(s: str) -> str:
     if not s:
         return ""
-    return "".join(ch for ch in s.upper() if ch.isalnum())
+    return _NORM_RE.sub("", s.upper())
+
+
+class CachedBed(NamedTuple):
+    id: int
+    bed_number: Optional[str]
+    bed_name: Optional[str]
+    # _norm() of number/name, computed once at load instead of per packet
+    number_norm: str
+    name_norm: str
+
+
+class CachedRoom(NamedTuple):
+    id: int
+    room_name: Optional[str]
+    beds: Tuple[CachedBed, ...]
+    # lower(stripped number or name) -> first bed (in id order) that has it
+    by_lower: Dict[str, CachedBed]
+    # stripped bed_number -> first bed (in id order) that has it
+    by_number: Dict[str, CachedBed]
+    # (bed, device, room) packet fields -> resolved bed; lives and dies with this snapshot
+    resolved: Dict[Tuple[str, str, str], Optional[CachedBed]]
+
+
+def _cached_room(room_id: int, room_name: Optional[str], beds) -> CachedRoom:
+    beds = tuple(beds)
+    by_lower: Dict[str, CachedBed] = {}
+    by_number: Dict[str, CachedBed] = {}
+    for b in beds:
+        if b.bed_number:
+            by_lower.setdefault(b.bed_number.strip().lower(), b)
+        if b.bed_name:
+            by_lower.setdefault(b.bed_name.strip().lower(), b)
+        by_number.setdefault((b.bed_number or "").strip(), b)
+    return CachedRoom(room_id, room_name, beds, by_lower, by_number, {})
+
+
+class RoomCache:
+    """
+    system_ip -> room (+ its beds), so the UDP path doesn't SELECT per packet.
+    Rooms/beds are edited outside this process (DB, admin tools), so the
+    snapshot is simply reloaded once it is TTL seconds old; an edit or an
+    unknown IP waits at most that long.
+    """
+
+    TTL = 5.0
+
+    def __init__(self):
+        self._by_ip: Dict[str, CachedRoom] = {}
+        self._stale = True
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, session):
+        beds_by_room: Dict[int, list] = {}
+        for b in session.query(Bed).filter(Bed.room_id.isnot(None)).order_by(Bed.id).all():
+            beds_by_room.setdefault(b.room_id, []).append(CachedBed(
+                b.id, b.bed_number, b.bed_name, _norm(b.bed_number or ""), _norm(b.bed_name or "")
+            ))
+
+        by_ip = {}
+        for r in session.query(Room).filter(Room.system_ip.isnot(None)).all():
+            by_ip[r.system_ip] = _cached_room(r.id, r.room_name, beds_by_room.get(r.id, ()))
+
+        with self._lock:
+            self._by_ip = by_ip
+            self._stale = False
+            self._loaded_at = time.monotonic()
+
+    def get(self, session, ip: str) -> Optional[CachedRoom]:
+        if self._stale or time.monotonic() - self._loaded_at >= self.TTL:
+            self.load(session)
+        return self._by_ip.get(ip)
+
+
+# ----------------- Active call sessions -----------------
+
+class ActiveSessions:
+    """
+    bed_id -> (call_session_id, current_event_type) for every active call session.
+    Only the UDP writer creates, updates or ends sessions, so this mirrors the
+    table. Changes made inside a transaction are staged in session.info and only
+    applied once it commits; a rolled-back batch leaves the map untouched.
+    """
+
+    def __init__(self):
+        self._by_bed: Dict[int, Tuple[int, str]] = {}
+
+    def load(self, session):
+        rows = session.execute(
+            select(CallSession.bed_id, CallSession.id, CallSession.current_event_type)
+            .where(CallSession.active_bed_id.isnot(None))
+        ).all()
+        self._by_bed = {r.bed_id: (r.id, r.current_event_type) for r in rows}
+
+    def get(self, session, bed_id: int) -> Optional[Tuple[int, str]]:
+        staged = session.info.get("active_cs")
+        if staged and bed_id in staged:
+            return staged[bed_id]
+        return self._by_bed.get(bed_id)
+
+    def stage(self, session, bed_id: int, value: Optional[Tuple[int, str]]):
+        session.info.setdefault("active_cs", {})[bed_id] = value
+
+    def apply(self, session):
+        for bed_id, value in session.info.pop("active_cs", {}).items():
+            if value is None:
+                self._by_bed.pop(bed_id, None)
+            else:
+                self._by_bed[bed_id] = value
+
+
+# ----------------- Response cache -----------------
+
+class ResponseCache:
+    """
+    Serialized JSON bodies keyed by endpoint. Entries expire after their ttl or
+    when invalidate(key) is called; the per-key version stops a request that
+    started before an invalidation from storing its now-stale result.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[bytes, float]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def set(self, key: str, body: bytes, ttl: float, version: int):
+        if self._versions.get(key, 0) == version:
+            self._entries[key] = (body, time.monotonic() + ttl)
+
+    def invalidate(self, *keys: str):
+        for key in keys:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+
+# /api/stats tolerates a couple of seconds of staleness. Config data has no
+# write endpoints here to invalidate it, so its ttl is how long an edit made
+# through the DB takes to show up.
+STATS_CACHE_TTL = 2.0
+CONFIG_CACHE_TTL = 5.0
 
 
-def resolve_bed_in_room(session, room: Room, decoded: dict):
-    if not room:
-        return None
+# ----------------- Globals -----------------
+
+engine = get_db_engine(
+    Config.DATABASE_URL,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_recycle=Config.DB_POOL_RECYCLE,
+)
+SessionLocal.configure(bind=engine)
+# workers of one server share their parent's pid, so they find the same shm slots
+camera_manager = CameraManager(
+    use_simulation=False,
+    shm_namespace=str(os.getppid() if Config.WEB_CONCURRENCY > 1 else os.getpid()),
+)
+# ws clients by id(ws); weak so a socket whose handler is gone can't linger here
+active_connections: "weakref.WeakValueDictionary[int, WebSocket]" = weakref.WeakValueDictionary()
+room_cache = RoomCache()
+active_sessions = ActiveSessions()
+response_cache = ResponseCache()
+
 
-    beds = session.query(Bed).filter(Bed.room_id == room.id).all()
-    if not beds:
+# ----------------- Helpers -----------------
+
+def get_session():
+    """FastAPI dependency: one session per request, closed afterwards."""
+    with SessionLocal() as session:
+        yield session
+
+
+# bounds the per-room memo if a device sends ever-changing text
+RESOLVE_MEMO_MAX = 1024
+
+
+def resolve_bed_in_room(room: CachedRoom, decoded: DecodedPacket) -> Optional[CachedBed]:
+    if not room or not room.beds:
         return None
 
+    # devices repeat the same few strings, so most packets end here
+    key = (decoded.bed, decoded.device, decoded.room)
+    memo = room.resolved
+    if key in memo:
+        return memo[key]
+
+    b = _match_bed(room, decoded)
+    if len(memo) >= RESOLVE_MEMO_MAX:
+        memo.clear()
+    memo[key] = b
+    return b
+
+
+def _match_bed(room: CachedRoom, decoded: DecodedPacket) -> Optional[CachedBed]:
+    beds = room.beds
+
     tokens = []
-    for key in ("bed", "device", "room"):
-        v = (decoded.get(key) or "").strip()
+    for v in (decoded.bed, decoded.device, decoded.room):
+        v = (v or "").strip()
         if v:
             tokens.append(v)
 
     # 1) exact match
     for t in tokens:
-        tl = t.lower()
-        for b in beds:
-            if b.bed_number and b.bed_number.strip().lower() == tl:
-                return b
-            if b.bed_name and b.bed_name.strip().lower() == tl:
-                return b
+        b = room.by_lower.get(t.lower())
+        if b:
+            return b
 
     # 2) normalized partial match
-    ntokens = [_norm(t) for t in tokens if t]
+    ntokens = [nt for nt in (_norm(t) for t in tokens) if nt]
     for b in beds:
-        bn = _norm(b.bed_number or "")
-        bname = _norm(b.bed_name or "")
+        bn = b.number_norm
+        bname = b.name_norm
         for nt in ntokens:
-            if not nt:
-                continue
             if (nt in bname) or (nt in bn) or (bname and bname in nt) or (bn and bn in nt):
                 return b
 
     # 3) numeric hint
-    joined = " ".join(tokens)
-    nums = re.findall(r"\b\d+\b", joined)
-    if nums:
-        for n in nums:
-            for b in beds:
-                if (b.bed_number or "").strip() == n:
-                    return b
+    for n in _NUM_RE.findall(" ".join(tokens)):
+        b = room.by_number.get(n)
+        if b:
+            return b
 
     # 4) fallback
     if len(beds) == 1:
@@ -89,25 +290,31 @@ def resolve_bed_in_room(session, room: Room, decoded: dict):
     return sorted(beds, key=lambda x: x.id)[0]
 
 
-def get_or_create_call_session(session, bed_id, event_type):
-    cs = session.query(CallSession).filter(
-        CallSession.bed_id == bed_id,
-        CallSession.status == "active"
-    ).first()
+def get_or_create_call_session(session, bed_id, event_type) -> int:
+    """Upsert the bed's active call session and return its id (no commit).
 
-    if cs:
-        cs.current_event_type = event_type
-        session.commit()
-        return cs
+    A repeat of the session's current event type needs no SQL at all. Otherwise
+    uk_call_sessions_active_bed makes a second active row for the bed a
+    duplicate key, which turns the INSERT into an UPDATE of the existing one.
+    LAST_INSERT_ID(id) makes lastrowid report that row's id in both cases.
+    """
+    known = active_sessions.get(session, bed_id)
+    if known and known[1] == event_type:
+        return known[0]
 
-    cs = CallSession(
+    stmt = mysql_insert(CallSession).values(
         bed_id=bed_id,
+        active_bed_id=bed_id,
         current_event_type=event_type,
         status="active"
     )
-    session.add(cs)
-    session.commit()
-    return cs
+    stmt = stmt.on_duplicate_key_update(
+        id=func.last_insert_id(CallSession.id),
+        current_event_type=stmt.inserted.current_event_type,
+    )
+    cs_id = session.execute(stmt).lastrowid
+    active_sessions.stage(session, bed_id, (cs_id, event_type))
+    return cs_id
 
 
 def init_database_tables():
@@ -142,93 +349,179 @@ def init_database_tables():
         raise
 
 
-def get_room_camera(session, room: Room):
-    if not room:
-        return None
-    return session.query(Camera).filter(
-        Camera.room_id == room.id,
-        Camera.status == "active"
-    ).order_by(Camera.id.desc()).first()
+def dumps_json(obj) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    # same encoding FastAPI's JSONResponse uses
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
 
 
-def _room_key(name: str) -> str:
-    return (name or "").strip()
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps_json(content)
 
 
-def serialize_event_with_camera(session, event: Event):
-    bed = event.bed
-    room = event.room or (bed.room if bed else None)
-    ward = room.ward if room else None
-    floor = ward.floor if ward else None
+async def cached_json(key: str, build, ttl: float) -> Response:
+    """Serve `key` from response_cache; on a miss run the (blocking) build() in the threadpool."""
+    body = response_cache.get(key)
+    if body is None:
+        version = response_cache.version(key)
+        body = dumps_json(await run_in_threadpool(build))
+        response_cache.set(key, body, ttl=ttl, version=version)
+    return Response(content=body, media_type="application/json")
 
-    cam = get_room_camera(session, room)
 
-    room_name = _room_key(room.room_name if room else None)
+def db_now() -> datetime:
+    """Now, as the naive Karachi wall-clock time the DATETIME columns hold.
+    Keeps range filters right even when the host runs in another timezone."""
+    return get_karachi_time().replace(tzinfo=None)
 
-    streaming_rooms = set(camera_manager.get_all_rooms())
+
+def _room_key(name: str) -> str:
+    return (name or "").strip()
+
+
+def serialize_event_row(row, streaming_rooms=None):
+    """
+    Build the event payload from a flat mapping (a row of _event_rows_stmt()).
+    `streaming_rooms`: set of room keys with a camera; pass it when serializing many events.
+    """
+    room_name = _room_key(row["room_name"])
+
+    if streaming_rooms is None:
+        streaming_rooms = set(camera_manager.get_all_rooms())
     camera_streaming = bool(room_name) and (room_name in streaming_rooms)
-    camera_live = bool(room_name) and camera_manager.has_frame(room_name)
+    camera_live = camera_streaming and camera_manager.has_frame(room_name)
 
     cam_url = f"/camera/{quote(room_name, safe='')}" if camera_streaming else None
 
-    ts = event.system_timestamp
-    ts_str = ts.strftime("%Y-%m-%dT%H:%M:%S") if ts else None
+    ts = row["system_timestamp"]
+    # DATETIME columns come back naive, so this is the same "YYYY-MM-DDTHH:MM:SS"
+    # strftime produced, without parsing a format string per event
+    ts_str = ts.isoformat(timespec="seconds") if ts else None
 
     return {
-        "id": event.id,
-        "call_session_id": event.call_session_id,
-        "event_type": event.event_type,
-        "event": event.event_type,
-        "status": event.status,
+        "id": row["id"],
+        "call_session_id": row["call_session_id"],
+        "event_type": row["event_type"],
+        "event": row["event_type"],
+        "status": row["status"],
         "system_timestamp": ts_str,
 
-        "bed_id": bed.id if bed else None,
-        "bed_name": bed.bed_name if bed else None,
-        "bed_number": bed.bed_number if bed else None,
+        "bed_id": row["bed_id"],
+        "bed_name": row["bed_name"],
+        "bed_number": row["bed_number"],
 
-        "room_id": room.id if room else None,
+        "room_id": row["room_id"],
         "room_name": room_name or None,
-        "room_number": room.room_number if room else None,
+        "room_number": row["room_number"],
 
-        "ward_name": ward.name if ward else None,
-        "floor_name": floor.name if floor else None,
+        "ward_name": row["ward_name"],
+        "floor_name": row["floor_name"],
 
         "camera_available": camera_streaming,   # stream thread exists
         "camera_live": camera_live,             # frames are actually coming
         "camera_url": cam_url,
 
-        "camera_configured": True if cam else False,
+        "camera_configured": bool(row["camera_configured"]),
     }
 
 
-def mjpeg_generator(room_name: str, fps: int = 10):
+def _event_rows_stmt():
+    # flat Core select: no ORM identity map/object construction, and
+    # bed/room/ward/floor/camera come back in the same round-trip
+    room_id = func.coalesce(Event.room_id, Bed.room_id)
+    camera_configured = select(Camera.id).where(
+        Camera.room_id == Room.id,
+        Camera.status == "active"
+    ).exists()
+
+    return (
+        select(
+            Event.id,
+            Event.call_session_id,
+            Event.event_type,
+            Event.status,
+            Event.system_timestamp,
+            Bed.id.label("bed_id"),
+            Bed.bed_name,
+            Bed.bed_number,
+            Room.id.label("room_id"),
+            Room.room_name,
+            Room.room_number,
+            Ward.name.label("ward_name"),
+            Floor.name.label("floor_name"),
+            camera_configured.label("camera_configured"),
+        )
+        .select_from(Event)
+        .outerjoin(Bed, Bed.id == Event.bed_id)
+        .outerjoin(Room, Room.id == room_id)
+        .outerjoin(Ward, Ward.id == Room.ward_id)
+        .outerjoin(Floor, Floor.id == Ward.floor_id)
+    )
+
+
+def _recent_events_stmt(limit: int):
+    return _event_rows_stmt().order_by(Event.id.desc()).limit(limit)
+
+
+# The CRLF that ends a part belongs to the next delimiter ("\r\n--frame"),
+# so each part is this header followed by the untouched JPEG bytes and the
+# payload never has to be copied into a bigger buffer.
+_MJPEG_HEADER = (
+    b"\r\n--frame\r\n"
+    b"Content-Type: image/jpeg\r\n"
+    b"Cache-Control: no-store\r\n"
+    b"Content-Length: %d\r\n\r\n"
+)
+
+
+def _mjpeg_header(payload: bytes) -> bytes:
+    return _MJPEG_HEADER % len(payload)
+
+
+# a stalled stream still re-sends its last image this often, which keeps the
+# connection alive and lets browsers that lag one part behind show it
+MJPEG_KEEPALIVE = 1.0
+
+
+async def mjpeg_generator(room_name: str, fps: int = 10):
+    # async: one coroutine per viewer instead of one threadpool thread each;
+    # get_frame() is a non-blocking read of the latest encoded frame
     room_name = _room_key(room_name)
     frame_delay = 1.0 / max(1, int(fps))
 
-    last_placeholder = 0.0
+    # cameras hand out the same bytes object until a new frame is encoded,
+    # so identity tells us whether there is anything new to send
+    last_frame = None
+    last_header = b""
+    last_sent = 0.0
 
     while True:
         frame = camera_manager.get_frame(room_name)
+        now = time.monotonic()
 
         if frame:
-            payload = frame
-            time.sleep(frame_delay)
+            if frame is last_frame and now - last_sent < MJPEG_KEEPALIVE:
+                # camera hasn't produced a new frame: poll again rather than resend it
+                await asyncio.sleep(frame_delay)
+                continue
+            if frame is not last_frame:
+                last_frame = frame
+                last_header = _mjpeg_header(frame)
+            header = last_header
         else:
             # Send placeholder at least once per second so <img> doesn't stay blank
-            now = time.time()
-            if now - last_placeholder < 1.0:
-                time.sleep(0.05)
+            if now - last_sent < MJPEG_KEEPALIVE:
+                await asyncio.sleep(0.05)
                 continue
-            last_placeholder = now
-            payload = _PLACEHOLDER_JPEG
-
-        yield (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n"
-            b"Cache-Control: no-store\r\n"
-            b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" +
-            payload + b"\r\n"
-        )
+            frame, header = _PLACEHOLDER_JPEG, _PLACEHOLDER_HEADER
+
+        last_sent = now
+        yield header
+        yield frame
+        await asyncio.sleep(frame_delay)
 
 # Small placeholder JPEG bytes (sent when no camera frame yet)
 _PLACEHOLDER_JPEG = base64.b64decode(
@@ -243,17 +536,50 @@ _PLACEHOLDER_JPEG = base64.b64decode(
     b"qgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgq"
     b"kqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqgqkqg//9k="
 )
+_PLACEHOLDER_HEADER = _mjpeg_header(_PLACEHOLDER_JPEG)
+
+# ----------------- Templates -----------------
+
+TEMPLATE_NAMES = ("dashboard.html", "calls.html", "history.html", "config.html")
+TEMPLATES: Dict[str, bytes] = {}
+
+
+def load_templates():
+    """Read the page templates once; restart the server to pick up edits (or set DEBUG=1)."""
+    for name in TEMPLATE_NAMES:
+        TEMPLATES[name] = Path("templates", name).read_bytes()
+
+
+def render_page(name: str) -> HTMLResponse:
+    if Config.DEBUG:
+        # template work: serve the file as it is on disk right now
+        return HTMLResponse(content=Path("templates", name).read_bytes())
+    return HTMLResponse(content=TEMPLATES[name])
+
 
 # ----------------- Lifespan -----------------
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_database_tables()
+    load_templates()
+
+    session = SessionLocal()
+    try:
+        room_cache.load(session)
+        active_sessions.load(session)
+    finally:
+        session.close()
+
+    # the UDP owner also owns the RTSP cameras; the other workers attach to its
+    # shared-memory frames instead of opening N sessions per camera
+    udp = await bind_udp()
+    camera_manager.attach_only = udp is None and Config.WEB_CONCURRENCY > 1
 
     # Load cameras from DB and start streams
-    session = get_db_session(engine)
+    session = SessionLocal()
     try:
-        cameras = session.query(Camera).options(joinedload(Camera.room)).filter(Camera.status == "active").all()
+        cameras = session.query(Camera).options(joinedload(Camera.room), raiseload("*")).filter(Camera.status == "active").all()
         for cam in cameras:
             if cam.room and cam.rtsp_url:
                 try:
@@ -263,12 +589,14 @@ async def lifespan(app: FastAPI):
     finally:
         session.close()
 
-    asyncio.create_task(udp_listener())
+    start_fanout()
+    if udp is not None:
+        asyncio.create_task(udp_listener(*udp))
     yield
     camera_manager.shutdown()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -278,26 +606,22 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.get("/")
 async def get_home():
-    with open("templates/dashboard.html", "r") as f:
-        return HTMLResponse(content=f.read())
+    return render_page("dashboard.html")
 
 
 @app.get("/calls")
 async def get_calls_page():
-    with open("templates/calls.html", "r") as f:
-        return HTMLResponse(content=f.read())
+    return render_page("calls.html")
 
 
 @app.get("/history")
 async def get_history_page():
-    with open("templates/history.html", "r") as f:
-        return HTMLResponse(content=f.read())
+    return render_page("history.html")
 
 
 @app.get("/config")
 async def get_config_page():
-    with open("templates/config.html", "r") as f:
-        return HTMLResponse(content=f.read())
+    return render_page("config.html")
 
 
 # ----------------- Camera Streams -----------------
@@ -308,11 +632,11 @@ async def video_feed_head(camera_id: int):
 
 
 @app.get("/video_feed/{camera_id}")
-async def video_feed(camera_id: int):
+def video_feed(camera_id: int):
     # kept for compatibility
-    session = get_db_session(engine)
+    session = SessionLocal()
     try:
-        cam = session.query(Camera).options(joinedload(Camera.room)).filter(Camera.id == camera_id).first()
+        cam = session.query(Camera).options(joinedload(Camera.room), raiseload("*")).filter(Camera.id == camera_id).first()
         if not cam or not cam.room:
             return JSONResponse({"error": "Camera not found"}, status_code=404)
         room_name = _room_key(cam.room.room_name)
@@ -362,139 +686,180 @@ async def camera_by_room(room_name: str):
 
 @app.get("/api/stats")
 async def get_stats():
-    session = get_db_session(engine)
-    try:
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-
-        total_active = session.query(Event).filter(
-            Event.created_at >= seven_days_ago,
-            Event.status == "active"
-        ).count()
-
-        urgent_alarms = session.query(Event).filter(
-            Event.created_at >= seven_days_ago,
-            Event.event_type.in_(("Emergency", "Alarm", "Assistance")),
-            Event.status == "active"
-        ).count()
-
-        ongoing_calls = session.query(Event).filter(
-            Event.created_at >= seven_days_ago,
-            Event.event_type == "Call",
-            Event.status == "active"
-        ).count()
-
-        recently_cleared = session.query(Event).filter(
-            Event.created_at >= one_hour_ago,
-            Event.status == "cleared"
-        ).count()
-
-        return {
-            "total_active": total_active,
-            "urgent_alarms": urgent_alarms,
-            "ongoing_calls": ongoing_calls,
-            "recently_cleared": recently_cleared
-        }
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            # one clock read so both windows end at the same instant
+            now = db_now()
+            seven_days_ago = now - timedelta(days=7)
+            one_hour_ago = now - timedelta(hours=1)
+
+            # one scan over the 7-day window; the 1-hour window is a subset of it
+            active = Event.status == "active"
+            row = session.execute(
+                select(
+                    func.sum(case((active, 1), else_=0)).label("total_active"),
+                    func.sum(case((and_(active, Event.event_type.in_(("Emergency", "Alarm", "Assistance"))), 1), else_=0)).label("urgent_alarms"),
+                    func.sum(case((and_(active, Event.event_type == "Call"), 1), else_=0)).label("ongoing_calls"),
+                    func.sum(case((and_(Event.status == "cleared", Event.created_at >= one_hour_ago), 1), else_=0)).label("recently_cleared"),
+                ).where(Event.created_at >= seven_days_ago)
+            ).one()
+
+            total_active = int(row.total_active or 0)
+            urgent_alarms = int(row.urgent_alarms or 0)
+            ongoing_calls = int(row.ongoing_calls or 0)
+            recently_cleared = int(row.recently_cleared or 0)
+
+            return {
+                "total_active": total_active,
+                "urgent_alarms": urgent_alarms,
+                "ongoing_calls": ongoing_calls,
+                "recently_cleared": recently_cleared
+            }
+        finally:
+            session.close()
+
+    return await cached_json("stats", build, ttl=STATS_CACHE_TTL)
+
+
+# the dashboard's "All" filter asks for 3650 days
+TIMELINE_MAX_DAYS = 3650
+
+
+@app.get("/api/timeline")
+async def get_timeline(days: int = 7):
+    days = min(max(int(days), 1), TIMELINE_MAX_DAYS)
+
+    def build():
+        session = SessionLocal()
+        try:
+            since = db_now() - timedelta(days=days)
+
+            # MySQL buckets with one range scan over ix_events_created_status_type;
+            # Python only sees (day, type, count) rows
+            day = func.date(Event.created_at).label("day")
+            rows = session.execute(
+                select(day, Event.event_type, func.count().label("n"))
+                .where(Event.created_at >= since)
+                .group_by(day, Event.event_type)
+            ).all()
+
+            timeline: Dict[str, Dict[str, int]] = {}
+            for r in rows:
+                timeline.setdefault(str(r.day), {})[r.event_type] = int(r.n)
+            return {"timeline": timeline}
+        finally:
+            session.close()
+
+    return await cached_json(f"timeline:{days}", build, ttl=STATS_CACHE_TTL)
 
 
 @app.get("/api/events/recent")
-async def get_recent_events(limit: int = 100):
-    session = get_db_session(engine)
-    try:
-        events = session.query(Event).options(
-            joinedload(Event.bed).joinedload(Bed.room).joinedload(Room.ward).joinedload(Ward.floor),
-            joinedload(Event.room).joinedload(Room.ward).joinedload(Ward.floor),
-        ).order_by(Event.id.desc()).limit(limit).all()
+def get_recent_events(limit: int = 100, session: Session = Depends(get_session)):
+    rows = session.execute(_recent_events_stmt(limit)).mappings().all()
 
-        return [serialize_event_with_camera(session, e) for e in events]
-    finally:
-        session.close()
+    streaming_rooms = set(camera_manager.get_all_rooms())
+    return FastJSONResponse([serialize_event_row(r, streaming_rooms) for r in rows])
 
 
 @app.get("/api/cameras")
-async def get_cameras():
-    session = get_db_session(engine)
-    try:
-        cams = session.query(Camera).options(joinedload(Camera.room)).all()
-        return {
-            "cameras": [{
-                "id": c.id,
-                "room_name": c.room.room_name if c.room else None,
-                "rtsp_url": c.rtsp_url,
-                "status": c.status
-            } for c in cams],
-            "rooms": camera_manager.get_all_rooms()
-        }
-    finally:
-        session.close()
+def get_cameras(session: Session = Depends(get_session)):
+    # only the four columns the page shows; no Camera/Room objects built
+    rows = session.execute(
+        select(Camera.id, Room.room_name, Camera.rtsp_url, Camera.status)
+        .select_from(Camera)
+        .outerjoin(Room, Room.id == Camera.room_id)
+    ).all()
+    return {
+        "cameras": [{
+            "id": c.id,
+            "room_name": c.room_name,
+            "rtsp_url": c.rtsp_url,
+            "status": c.status
+        } for c in rows],
+        "rooms": camera_manager.get_all_rooms()
+    }
 
 
 # ---- Config GET endpoints ----
 
 @app.get("/api/config/floors")
 async def get_floors():
-    session = get_db_session(engine)
-    try:
-        floors = session.query(Floor).all()
-        return {"floors": [{"id": f.id, "name": f.name} for f in floors]}
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            floors = session.query(Floor).all()
+            return {"floors": [{"id": f.id, "name": f.name} for f in floors]}
+        finally:
+            session.close()
+
+    return await cached_json("floors", build, ttl=CONFIG_CACHE_TTL)
 
 
 @app.get("/api/config/wards")
 async def get_wards():
-    session = get_db_session(engine)
-    try:
-        wards = session.query(Ward).all()
-        return {"wards": [{"id": w.id, "name": w.name, "floor_id": w.floor_id} for w in wards]}
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            wards = session.query(Ward).all()
+            return {"wards": [{"id": w.id, "name": w.name, "floor_id": w.floor_id} for w in wards]}
+        finally:
+            session.close()
+
+    return await cached_json("wards", build, ttl=CONFIG_CACHE_TTL)
 
 
 @app.get("/api/config/rooms")
 async def get_rooms():
-    session = get_db_session(engine)
-    try:
-        rooms = session.query(Room).all()
-        return {"rooms": [{
-            "id": r.id,
-            "room_name": r.room_name,
-            "room_number": r.room_number,
-            "ward_id": r.ward_id,
-            "system_ip": getattr(r, "system_ip", None),
-            "status": getattr(r, "status", None),
-        } for r in rooms]}
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            rooms = session.query(Room).all()
+            return {"rooms": [{
+                "id": r.id,
+                "room_name": r.room_name,
+                "room_number": r.room_number,
+                "ward_id": r.ward_id,
+                "system_ip": getattr(r, "system_ip", None),
+                "status": getattr(r, "status", None),
+            } for r in rooms]}
+        finally:
+            session.close()
+
+    return await cached_json("rooms", build, ttl=CONFIG_CACHE_TTL)
 
 
 @app.get("/api/config/beds")
 async def get_beds():
-    session = get_db_session(engine)
-    try:
-        beds = session.query(Bed).all()
-        return {"beds": [{
-            "id": b.id,
-            "room_id": b.room_id,
-            "bed_name": b.bed_name,
-            "bed_number": b.bed_number,
-            "camera_id": getattr(b, "camera_id", None),
-            "status": getattr(b, "status", None),
-        } for b in beds]}
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            beds = session.query(Bed).all()
+            return {"beds": [{
+                "id": b.id,
+                "room_id": b.room_id,
+                "bed_name": b.bed_name,
+                "bed_number": b.bed_number,
+                "camera_id": getattr(b, "camera_id", None),
+                "status": getattr(b, "status", None),
+            } for b in beds]}
+        finally:
+            session.close()
+
+    return await cached_json("beds", build, ttl=CONFIG_CACHE_TTL)
 
 
 @app.get("/api/config/colors")
 async def get_colors():
-    session = get_db_session(engine)
-    try:
-        colors = session.query(ColorScheme).all()
-        return {"colors": [{"id": c.id, "event_type": c.event_type, "color": c.color} for c in colors]}
-    finally:
-        session.close()
+    def build():
+        session = SessionLocal()
+        try:
+            colors = session.query(ColorScheme).all()
+            return {"colors": [{"id": c.id, "event_type": c.event_type, "color": c.color} for c in colors]}
+        finally:
+            session.close()
+
+    return await cached_json("colors", build, ttl=CONFIG_CACHE_TTL)
 
 
 # ----------------- WebSocket -----------------
@@ -516,93 +881,341 @@ async def websocket_endpoint(ws: WebSocket):
 
 # ----------------- UDP Listener -----------------
 
-async def udp_listener():
-    loop = asyncio.get_event_loop()
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+UDP_BATCH_MAX = 64
+UDP_BATCH_MS = 50
+WS_SEND_TIMEOUT = 0.5
+# kernel-side headroom for bursts that arrive while the loop is busy committing
+UDP_RCVBUF = 1 << 20
+
+# devices re-send the same event several times a second until it is cleared;
+# a repeat of the last event for the same bed within DEDUP_TTL is dropped.
+# Like ActiveSessions, packets seen inside a transaction are staged in
+# session.info and only recorded once it commits.
+DEDUP_TTL = 1.0
+DEDUP_PRUNE_AT = 4096
+_LAST_SEEN: Dict[tuple, Tuple[str, float]] = {}
+
+
+def _dedup_key(ip: str, bed_id: Optional[int], decoded: DecodedPacket) -> tuple:
+    # one intercom serves many beds, so the ip alone is not enough; when the
+    # bed can't be resolved fall back to both decoded labels
+    if bed_id:
+        return (ip, bed_id)
+    return (ip, decoded.room, decoded.bed)
+
+
+def is_repeat(session, key: tuple, event_type: str, now: float) -> bool:
+    staged = session.info.setdefault("seen", {})
+    last = staged.get(key) or _LAST_SEEN.get(key)
+    if last and last[0] == event_type and now - last[1] < DEDUP_TTL:
+        return True
+    staged[key] = (event_type, now)
+    return False
+
+
+def record_seen(session):
+    seen = session.info.pop("seen", None)
+    if not seen:
+        return
+    _LAST_SEEN.update(seen)
+    if len(_LAST_SEEN) > DEDUP_PRUNE_AT:
+        now = time.monotonic()
+        for k in [k for k, (_, ts) in _LAST_SEEN.items() if now - ts >= DEDUP_TTL]:
+            del _LAST_SEEN[k]
+
+
+class L7700Protocol(asyncio.DatagramProtocol):
+    """Queues raw datagrams straight from the event loop's selector; no threadpool hop."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    def datagram_received(self, data: bytes, addr):
+        self.queue.put_nowait((data, addr[0]))
 
+    def error_received(self, exc):
+        print(f"✗ UDP receive error: {exc}")
+
+
+def apply_packet(session, decoded: DecodedPacket, incoming_ip: str, system_time) -> Optional[Event]:
+    """Stage the call-session changes and Event row for one packet (no commit).
+    Returns None for a repeat that was dropped."""
+    room = room_cache.get(session, incoming_ip)
+    bed = resolve_bed_in_room(room, decoded) if room else None
+
+    event_type = decoded.event or "Unknown"
+
+    room_id = room.id if room else None
+    bed_id = bed.id if bed else None
+
+    if is_repeat(session, _dedup_key(incoming_ip, bed_id, decoded), event_type, time.monotonic()):
+        return None
+
+    # reset ends session
+    is_reset = event_type == EVENT_RESET
+    if is_reset and bed_id:
+        # one UPDATE through the unique key instead of SELECT + UPDATE at flush
+        session.execute(
+            update(CallSession)
+            .where(CallSession.active_bed_id == bed_id)
+            .values(status="ended", ended_at=system_time, active_bed_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        active_sessions.stage(session, bed_id, None)
+
+    call_session_id = None
+    if not is_reset and bed_id:
+        call_session_id = get_or_create_call_session(session, bed_id, event_type)
+
+    event = Event(
+        room_id=room_id,
+        bed_id=bed_id,
+        call_session_id=call_session_id,
+        device_timestamp=decoded.timestamp,
+        system_timestamp=system_time,
+        room_identifier=decoded.room,
+        device_type=decoded.device,
+        event_type=event_type,
+        status="active",
+        raw_hex=decoded.raw_hex,
+        created_at=system_time
+    )
+    session.add(event)
+    return event
+
+
+async def _send_with_timeout(ws: WebSocket, messages: List[bytes]):
+    # in order per client; a stalled client is dropped instead of holding up everyone else
+    for message in messages:
+        await asyncio.wait_for(ws.send_bytes(message), timeout=WS_SEND_TIMEOUT)
+
+
+async def broadcast(messages: List[bytes]):
+    """Send to all clients concurrently; prune the ones that fail or time out."""
+    conns = tuple(active_connections.items())
+    if not conns or not messages:
+        return
+    # one gather per batch: each client drains the whole batch on its own,
+    # so a slow client costs the others nothing between messages either
+    results = await asyncio.gather(
+        *(_send_with_timeout(w, messages) for _, w in conns),
+        return_exceptions=True
+    )
+    for (cid, w), result in zip(conns, results):
+        if isinstance(result, Exception):
+            active_connections.pop(cid, None)
+            # close it too, so the page notices and reconnects instead of
+            # sitting on a socket that no longer gets updates
+            task = asyncio.create_task(_close_quietly(w))
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+
+_closing = set()
+
+
+async def _close_quietly(ws: WebSocket):
     try:
-        sock.bind((Config.UDP_IP, Config.UDP_PORT))
-        print(f"✓ UDP listener bound to {Config.UDP_IP}:{Config.UDP_PORT}")
-    except OSError as e:
-        print(f"✗ Error binding UDP {Config.UDP_PORT}: {e}")
+        await asyncio.wait_for(ws.close(code=1011), timeout=WS_SEND_TIMEOUT)
+    except Exception:
+        pass
+
+
+def _store_in_transaction(session, batch) -> List[Event]:
+    events = []
+    try:
+        with session.begin():
+            for decoded, incoming_ip in batch:
+                event = apply_packet(session, decoded, incoming_ip, get_karachi_time())
+                if event is not None:
+                    events.append(event)
+            # flush assigns event ids; MySQL has no RETURNING so this stays per-row,
+            # but the whole batch shares a single COMMIT
+            session.flush()
+    except Exception:
+        # rolled back: forget whatever this attempt staged
+        session.info.pop("active_cs", None)
+        session.info.pop("seen", None)
+        raise
+    active_sessions.apply(session)
+    record_seen(session)
+    return events
+
+
+def store_packets(batch, want_rows: bool):
+    """Persist a batch of packets in one transaction (blocking; runs in a worker thread).
+    Returns the stored events as flat rows when want_rows is set, else []."""
+    with SessionLocal() as session:
+        try:
+            events = _store_in_transaction(session, batch)
+        except Exception as e:
+            if len(batch) == 1:
+                raise
+            # one bad packet must not cost the rest of the batch: redo it one
+            # packet per transaction and drop only the ones that fail again
+            print(f"✗ UDP/DB error ({len(batch)} packet(s)): {e}; retrying one at a time")
+            events = []
+            for packet in batch:
+                try:
+                    events.extend(_store_in_transaction(session, [packet]))
+                except Exception as e:
+                    print(f"✗ Dropped packet from {packet[1]}: {e}")
+
+        if not want_rows or not events:
+            return []
+
+        # one SELECT for the whole batch instead of lazy-loading
+        # bed/room/ward/floor/cameras per event
+        return session.execute(
+            _event_rows_stmt()
+            .where(Event.id.in_([e.id for e in events]))
+            .order_by(Event.id)
+        ).mappings().all()
+
+
+# ----- cross-worker fan-out -----
+# Only one worker can bind the UDP port, but websocket clients connect to any of
+# them. With REDIS_URL set, the UDP worker publishes each message and every
+# worker (itself included) forwards it to its own clients.
+
+WS_CHANNEL = "l7700:events"
+_redis = None
+
+
+def start_fanout():
+    global _redis
+    if not Config.REDIS_URL:
+        if Config.WEB_CONCURRENCY > 1:
+            print("⚠ WEB_CONCURRENCY > 1 without REDIS_URL: only the UDP worker's clients get live updates")
+        return
+    if aioredis is None:
+        print("⚠ REDIS_URL is set but the redis package is not installed; broadcasting locally")
         return
+    _redis = aioredis.from_url(Config.REDIS_URL)
+    asyncio.create_task(redis_subscriber())
+
+
+async def publish(messages: List[bytes]):
+    if _redis is None:
+        await broadcast(messages)
+        return
+    try:
+        async with _redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.publish(WS_CHANNEL, message)
+            await pipe.execute()
+    except Exception as e:
+        # the events are already stored; at least this worker's clients get them
+        print(f"✗ Redis publish error: {e}; broadcasting locally")
+        await broadcast(messages)
 
-    print(f"🎧 Listening for L7700 UDP on {Config.UDP_IP}:{Config.UDP_PORT}")
-    print(f"⏰ {get_karachi_time().strftime('%Y-%m-%d %H:%M:%S')}")
 
+async def redis_subscriber():
     while True:
         try:
-            data, addr = await loop.run_in_executor(None, sock.recvfrom, 2048)
-            incoming_ip = addr[0]
+            pubsub = _redis.pubsub()
+            await pubsub.subscribe(WS_CHANNEL)
+            async for msg in pubsub.listen():
+                if msg["type"] != "message":
+                    continue
+                # the event may have come from another worker's writer
+                response_cache.invalidate("stats")
+                await broadcast([msg["data"]])
+        except Exception as e:
+            print(f"✗ Redis subscriber error: {e}; retrying")
+            await asyncio.sleep(1.0)
 
-            decoded = decode_l7700_packet(data)
-            if not decoded:
-                continue
 
-            session = get_db_session(engine)
+async def write_packets(batch):
+    """Store a batch off the event loop, then broadcast each event."""
+    try:
+        # nobody listening (here, or in another worker): skip the read-back and serialization
+        want_rows = _redis is not None or bool(active_connections)
+        rows = await run_in_threadpool(store_packets, batch, want_rows)
+
+        # the dashboard re-reads /api/stats on every broadcast
+        response_cache.invalidate("stats")
+
+        if not rows:
+            return
+
+        streaming_rooms = set(camera_manager.get_all_rooms())
+        # encoded once; every client gets the same bytes as binary frames
+        await publish([dumps_json(serialize_event_row(row, streaming_rooms)) for row in rows])
+
+    except Exception as e:
+        print(f"✗ UDP/DB error ({len(batch)} packet(s)): {e}")
+
+
+async def packet_writer(queue: asyncio.Queue):
+    """Drain (datagram, ip) items in micro-batches of up to UDP_BATCH_MAX / UDP_BATCH_MS."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + UDP_BATCH_MS / 1000.0
+        while len(batch) < UDP_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
             try:
-                room = session.query(Room).filter(Room.system_ip == incoming_ip).first()
-                bed = resolve_bed_in_room(session, room, decoded) if room else None
-
-                system_time = get_karachi_time()
-                event_type = decoded.get("event") or "Unknown"
-
-                room_id = room.id if room else None
-                bed_id = bed.id if bed else None
-
-                # reset ends session
-                if event_type.lower() == "reset" and bed_id:
-                    cs = session.query(CallSession).filter(
-                        CallSession.bed_id == bed_id,
-                        CallSession.status == "active"
-                    ).first()
-                    if cs:
-                        cs.status = "ended"
-                        cs.ended_at = system_time
-                        session.commit()
-
-                call_session_id = None
-                if event_type.lower() != "reset" and bed_id:
-                    cs = get_or_create_call_session(session, bed_id, event_type)
-                    call_session_id = cs.id
-
-                event = Event(
-                    room_id=room_id,
-                    bed_id=bed_id,
-                    call_session_id=call_session_id,
-                    device_timestamp=decoded.get("timestamp"),
-                    system_timestamp=system_time,
-                    room_identifier=decoded.get("room"),
-                    device_type=decoded.get("device"),
-                    event_type=event_type,
-                    status="active",
-                    raw_hex=decoded.get("raw_hex")
-                )
-                session.add(event)
-                session.commit()
-
-                payload = serialize_event_with_camera(session, event)
-                message = json.dumps(payload)
-
-                dead = []
-                for cid, w in active_connections.items():
-                    try:
-                        await w.send_text(message)
-                    except Exception:
-                        dead.append(cid)
-                for cid in dead:
-                    active_connections.pop(cid, None)
-
-            except Exception as e:
-                session.rollback()
-                print(f"✗ UDP/DB error: {e}")
-            finally:
-                session.close()
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
 
+        try:
+            decoded_batch = decode_l7700_batch([data for data, _ in batch])
+            # repeats are dropped in apply_packet, once the bed is resolved
+            packets = [(decoded, ip) for (_, ip), decoded in zip(batch, decoded_batch) if decoded]
+            if packets:
+                await write_packets(packets)
         except Exception as e:
             print(f"✗ UDP loop error: {e}")
 
 
+async def bind_udp():
+    """Bind the L7700 UDP port. Returns (transport, queue), or None if it is
+    taken; with several workers exactly one gets it and becomes the owner."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: L7700Protocol(queue),
+            local_addr=(Config.UDP_IP, Config.UDP_PORT),
+        )
+        print(f"✓ UDP listener bound to {Config.UDP_IP}:{Config.UDP_PORT}")
+    except OSError as e:
+        if Config.WEB_CONCURRENCY > 1:
+            # another worker already owns the port and does all the writing
+            print(f"UDP {Config.UDP_PORT} is bound by another worker; this one only serves clients")
+        else:
+            print(f"✗ Error binding UDP {Config.UDP_PORT}: {e}")
+        return None
+
+    try:
+        transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF)
+    except OSError as e:
+        print(f"✗ Could not raise UDP receive buffer: {e}")
+    return transport, queue
+
+
+async def udp_listener(transport, queue: asyncio.Queue):
+    print(f"🎧 Listening for L7700 UDP on {Config.UDP_IP}:{Config.UDP_PORT}")
+    print(f"⏰ {get_karachi_time().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    try:
+        await packet_writer(queue)
+    finally:
+        transport.close()
+
 if __name__ == "__main__":
     # Cameras + OpenCV are unstable with reload=True. Keep reload OFF.
-    uvicorn.run("server:app", host=Config.SERVER_HOST, port=Config.SERVER_PORT, reload=False)
+    # With several workers, the one that binds UDP runs the RTSP cameras and the
+    # others read its frames from shared memory; set REDIS_URL for live updates.
+    uvicorn.run(
+        "server:app",
+        host=Config.SERVER_HOST,
+        port=Config.SERVER_PORT,
+        reload=False,
+        workers=Config.WEB_CONCURRENCY,
+    )
@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# server.py mounts ./static and reads ./templates relative to the working directory
+os.chdir(ROOT)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import server
+from models import Base, Bed, Camera, Event, Floor, Room, Ward
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    server.SessionLocal.configure(bind=engine)
+    monkeypatch.setattr(server, "response_cache", server.ResponseCache())
+    with server.SessionLocal() as session:
+        floor = Floor(name="F1", floor_number=1)
+        ward = Ward(name="W1", floor=floor)
+        room = Room(room_number="12", room_name="ROOM 12", ward=ward, system_ip="10.0.0.5")
+        bed = Bed(bed_number="2", bed_name="Bed No 2", room=room)
+        camera = Camera(room=room, camera_name="c", rtsp_url="demo://x", status="active")
+        session.add_all([floor, ward, room, bed, camera])
+        session.commit()
+    yield engine
+    server.SessionLocal.configure(bind=server.engine)
+    engine.dispose()
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+def add_events(engine, *events):
+    """events: (event_type, status, age) tuples, age a timedelta before now."""
+    now = server.db_now()
+    with server.SessionLocal() as session:
+        bed = session.query(Bed).one()
+        for event_type, status, age in events:
+            t = now - age
+            session.add(Event(room_id=bed.room_id, bed_id=bed.id, event_type=event_type,
+                              status=status, system_timestamp=t, created_at=t))
+        session.commit()
+    return now
+
+
+def test_stats(db):
+    add_events(
+        db,
+        ("Call", "active", timedelta(minutes=5)),
+        ("Call", "active", timedelta(days=2)),
+        ("Alarm", "active", timedelta(hours=3)),
+        ("Emergency", "active", timedelta(days=6)),
+        ("Call", "cleared", timedelta(minutes=30)),
+        ("Call", "cleared", timedelta(hours=2)),
+        ("Call", "active", timedelta(days=8)),
+    )
+    stats = body(asyncio.run(server.get_stats()))
+    assert stats == {
+        "total_active": 4,
+        "urgent_alarms": 2,
+        "ongoing_calls": 2,
+        "recently_cleared": 1,
+    }
+
+
+def test_stats_is_cached_until_invalidated(db):
+    add_events(db, ("Call", "active", timedelta(minutes=5)))
+    assert body(asyncio.run(server.get_stats()))["total_active"] == 1
+
+    add_events(db, ("Call", "active", timedelta(minutes=1)))
+    assert body(asyncio.run(server.get_stats()))["total_active"] == 1
+
+    server.response_cache.invalidate("stats")
+    assert body(asyncio.run(server.get_stats()))["total_active"] == 2
+
+
+def test_timeline_buckets_by_day_and_type(db):
+    now = add_events(
+        db,
+        ("Call", "active", timedelta(0)),
+        ("Call", "cleared", timedelta(0)),
+        ("Alarm", "active", timedelta(0)),
+        ("Call", "active", timedelta(days=3)),
+        ("Call", "active", timedelta(days=20)),
+    )
+    timeline = body(asyncio.run(server.get_timeline(days=7)))["timeline"]
+    today = str(now.date())
+    three_days_ago = str((now - timedelta(days=3)).date())
+    assert timeline == {today: {"Call": 2, "Alarm": 1}, three_days_ago: {"Call": 1}}
+
+
+def test_timeline_all_covers_the_dashboard_range(db):
+    # the dashboard's "All" filter sends days=3650
+    now = add_events(db, ("Call", "active", timedelta(days=400)))
+    timeline = body(asyncio.run(server.get_timeline(days=3650)))["timeline"]
+    assert timeline == {str((now - timedelta(days=400)).date()): {"Call": 1}}
+
+    assert body(asyncio.run(server.get_timeline(days=365)))["timeline"] == {}
+
+
+def test_recent_events(db):
+    add_events(
+        db,
+        ("Call", "active", timedelta(minutes=3)),
+        ("Alarm", "active", timedelta(minutes=2)),
+        ("Reset", "active", timedelta(minutes=1)),
+    )
+    with server.SessionLocal() as session:
+        events = body(server.get_recent_events(limit=2, session=session))
+
+    assert [e["event_type"] for e in events] == ["Reset", "Alarm"]
+    e = events[0]
+    assert e["event"] == "Reset"
+    assert e["bed_name"] == "Bed No 2"
+    assert e["room_name"] == "ROOM 12"
+    assert e["ward_name"] == "W1"
+    assert e["floor_name"] == "F1"
+    assert e["camera_configured"] is True
+    # no stream registered in camera_manager for this room
+    assert e["camera_available"] is False
+    assert e["camera_url"] is None
+    # second precision ISO format, same as the pre-isoformat strftime output
+    assert len(e["system_timestamp"]) == 19 and e["system_timestamp"][10] == "T"
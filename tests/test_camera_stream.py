@@ -0,0 +1,129 @@
+import random
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import camera_stream
+from camera_stream import RealCameraStream, SharedMemoryCameraReader, ProcessCameraStream, _shm_name
+
+
+class FakeCapture:
+    """Delivers `frames` frames at `fps` with +/- jitter seconds of arrival noise."""
+
+    def __init__(self, clock, frames: int, fps: float, jitter: float):
+        self.clock = clock
+        self.frames = frames
+        self.fps = fps
+        self.jitter = jitter
+        self.grabbed = 0
+        self.rng = random.Random(1)
+
+    def isOpened(self):
+        return True
+
+    def set(self, *args):
+        return True
+
+    def grab(self):
+        if self.grabbed >= self.frames:
+            return False
+        self.grabbed += 1
+        self.clock[0] = 1000.0 + self.grabbed / self.fps + self.rng.uniform(-self.jitter, self.jitter)
+        return True
+
+    def retrieve(self):
+        return True, np.zeros((120, 160, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class CountingStream(RealCameraStream):
+    def __init__(self, capture, frames):
+        super().__init__("rtsp://camera", "Room 1")
+        self.capture = capture
+        self.frames = frames
+        self.published = 0
+
+    def _publish(self, frame, jpeg):
+        self.published += 1
+
+    def _encode(self, frame):
+        return b""
+
+
+def run_capture(monkeypatch, frames, fps, jitter):
+    clock = [1000.0]
+    cap = FakeCapture(clock, frames, fps, jitter)
+    monkeypatch.setattr(camera_stream.cv2, "VideoCapture", lambda *args: cap)
+    monkeypatch.setattr(camera_stream.time, "monotonic", lambda: clock[0])
+    stream = CountingStream(cap, frames)
+    # stop once the fake stream runs dry instead of sleeping to reconnect
+    stream.reconnect_delay = 0
+    real_grab = cap.grab
+
+    def grab():
+        ok = real_grab()
+        if not ok:
+            stream._stop.set()
+        return ok
+
+    cap.grab = grab
+    stream._capture_frames()
+    return stream.published
+
+
+def test_jittery_30fps_camera_keeps_its_frame_rate(monkeypatch):
+    assert run_capture(monkeypatch, frames=300, fps=30, jitter=0.005) >= 295
+
+
+def test_faster_camera_is_thinned_to_frame_interval(monkeypatch):
+    published = run_capture(monkeypatch, frames=600, fps=60, jitter=0.002)
+    assert 290 <= published <= 310
+
+
+@pytest.mark.parametrize("name", ["R1", "Cardiology Ward Room 204", "Pediatric Intensive Care Unit Room 1204"])
+def test_room_label_is_not_clipped(name):
+    stream = RealCameraStream("rtsp://camera", name)
+    (text_w, _), _ = cv2.getTextSize(f"Room: {name}", cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+    assert stream._label.shape[1] >= text_w + 5
+    # nothing drawn in the last column: the text ends inside the buffer
+    assert not stream._label[:, -1].any()
+
+
+def test_synth_fallback_fills_every_channel():
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    cv2.randu(frame, (20, 20, 20), (80, 80, 80))
+    assert (frame.reshape(-1, 3).min(axis=0) >= 20).all()
+    assert (frame.reshape(-1, 3).max(axis=0) > 20).all()
+
+
+def test_reader_serves_publisher_frames():
+    name = _shm_name("test%d" % time.monotonic_ns(), "Room A")
+    owner = ProcessCameraStream("rtsp://camera", "Room A", name)
+    owner._shm = owner._create_shm()
+    camera_stream._SHM_HEADER.pack_into(owner._shm.buf, 0, 0, 0, 0.0)
+    publisher = camera_stream._SharedMemoryPublisher(
+        "rtsp://camera", "Room A", owner._shm, owner._lock, owner._stop
+    )
+    reader = SharedMemoryCameraReader("Room A", name)
+    try:
+        reader.start()
+        assert not reader.has_frame()
+        assert reader.get_frame() is None
+
+        publisher._publish(None, b"frame-1")
+        assert reader.has_frame()
+        assert reader.get_frame() == owner.get_frame() == b"frame-1"
+
+        # publisher mid-write: odd seq, the reader keeps the last complete frame
+        camera_stream.struct.pack_into("<I", owner._shm.buf, 0, publisher._seq + 1)
+        assert reader.get_frame() == b"frame-1"
+
+        publisher._publish(None, b"frame-2")
+        assert reader.get_frame() == b"frame-2"
+    finally:
+        reader.stop()
+        owner.stop()
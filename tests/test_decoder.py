@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import baseline_decoder
+import decoder
+from decoder import EVENT_CANDIDATES, UNKNOWN, decode_l7700_batch, decode_l7700_packet
+
+
+def packet(text: bytes, ts=bytes([24, 5, 6, 7, 8, 9, 0, 0])) -> bytes:
+    return b"\x02" + b"\x00" * 16 + ts + text + b"\x03"
+
+
+CASES = [
+    b"Bed No 2 ROOM 12 Call",
+    b"Bed No. 14 ICU ROOM 3 Alarm",
+    b"Bed#7 RM 02 Presence",
+    b"WARD A BED-9 ROOM 4 Doctor Present",
+    b"ROOM 12 INTERCALL-IP Reset",
+    b"Bed No 1 ROOM 12 INTERCALL-IP Call waiting",
+    b"Bed No 1 ROOM 12 INTERCALL-IP RESET",
+    b"Bed No 1 ROOM 12 INTERCALL-IP reset",
+    b"Bed No 1 ROOM 12 INTERCALL-IP SomethingNew",
+    b"Bed No 1 ROOM 12 INTERCALL-IP \x00\x00",
+    b"Bed No 3 ROOM 5 Cancel Call",
+    b"CATERING SERVICE requested in ROOM 8",
+    b"Emergency LowBattery DEVICE-01",
+    b"no known words here",
+    b"\xe9\xe8 Bed No 5 caf\xe9 ROOM 1 Isolate",
+    b"",
+]
+
+
+def canonical_event(event: str) -> str:
+    # the decoder returns the EVENT_CANDIDATES spelling for a known word in any case
+    for c in EVENT_CANDIDATES:
+        if c.lower() == event.lower():
+            return c
+    return event
+
+
+def assert_matches_baseline(data: bytes):
+    expected = baseline_decoder.decode_l7700_packet(data)
+    got = decode_l7700_packet(data)
+    if expected is None:
+        assert got is None
+        return
+    assert got is not None
+    got = got._asdict()
+    expected["event"] = canonical_event(expected["event"])
+    assert got == expected
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_matches_baseline(text):
+    assert_matches_baseline(packet(text))
+
+
+def test_matches_baseline_fuzzed():
+    words = [b"Bed", b"BED", b"No", b"No.", b"#", b"ROOM", b"RM", b"ICU", b"-", b":",
+             b"INTERCALL-IP", b"\x00", b"\xe9", b"12", b"3", b"0042"]
+    words += [c.encode() for c in EVENT_CANDIDATES]
+    words += [c.upper().encode() for c in EVENT_CANDIDATES]
+    rng = random.Random(7700)
+    for _ in range(2000):
+        text = b" ".join(rng.choice(words) for _ in range(rng.randint(0, 10)))
+        ts = bytes(rng.randrange(256) for _ in range(8))
+        assert_matches_baseline(packet(text, ts))
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x02\x03",
+    b"\x02" + b"\x00" * 23 + b"\x03",
+    b"\x01" + b"\x00" * 30 + b"\x03",
+    b"\x02" + b"\x00" * 30 + b"\x04",
+])
+def test_rejects_malformed(data):
+    assert decode_l7700_packet(data) is None
+    assert baseline_decoder.decode_l7700_packet(data) is None
+
+
+def test_reset_in_any_case_is_event_reset():
+    for word in (b"Reset", b"RESET", b"reset"):
+        d = decode_l7700_packet(packet(b"Bed No 1 ROOM 12 INTERCALL-IP " + word))
+        assert d.event is decoder.EVENT_RESET
+
+
+def test_batch_is_aligned_with_input():
+    good = packet(b"Bed No 2 ROOM 12 Call")
+    out = decode_l7700_batch([good, b"junk", good])
+    assert out[1] is None
+    assert out[0] == out[2] == decode_l7700_packet(good)
+
+
+def test_unmatched_fields_are_unknown():
+    d = decode_l7700_packet(packet(b"!!"))
+    assert d.event == UNKNOWN
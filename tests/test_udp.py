@@ -0,0 +1,61 @@
+import pytest
+
+import server
+from decoder import decode_l7700_packet
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+
+
+@pytest.fixture(autouse=True)
+def last_seen(monkeypatch):
+    seen = {}
+    monkeypatch.setattr(server, "_LAST_SEEN", seen)
+    return seen
+
+
+def decoded(text: bytes):
+    return decode_l7700_packet(b"\x02" + b"\x00" * 16 + bytes(8) + text + b"\x03")
+
+
+def test_repeat_within_ttl_is_dropped():
+    session = FakeSession()
+    key = server._dedup_key("10.0.0.5", 1, decoded(b"Bed No 1 ROOM 12 Call"))
+    assert not server.is_repeat(session, key, "Call", 100.0)
+    assert server.is_repeat(session, key, "Call", 100.5)
+    assert not server.is_repeat(session, key, "Call", 100.0 + server.DEDUP_TTL)
+
+
+def test_beds_on_one_intercom_dedup_separately():
+    # both packets decode to the same room label, which used to be the whole key
+    session = FakeSession()
+    d1 = decoded(b"ICU ROOM 12 Bed No 1 Reset")
+    d2 = decoded(b"ICU ROOM 12 Bed No 2 Reset")
+    assert d1.bed == d2.bed
+    assert not server.is_repeat(session, server._dedup_key("10.0.0.5", 1, d1), "Reset", 0.0)
+    assert not server.is_repeat(session, server._dedup_key("10.0.0.5", 2, d2), "Reset", 0.0)
+    # unresolved beds fall back to both decoded labels
+    assert not server.is_repeat(session, server._dedup_key("10.0.0.5", None, d1), "Reset", 0.0)
+    assert not server.is_repeat(session, server._dedup_key("10.0.0.5", None, d2), "Reset", 0.0)
+
+
+def test_new_event_for_same_bed_is_not_a_repeat():
+    session = FakeSession()
+    key = ("10.0.0.5", 1)
+    assert not server.is_repeat(session, key, "Call", 0.0)
+    assert not server.is_repeat(session, key, "Reset", 0.1)
+
+
+def test_marks_only_recorded_on_commit(last_seen):
+    key = ("10.0.0.5", 1)
+    rolled_back = FakeSession()
+    assert not server.is_repeat(rolled_back, key, "Call", 0.0)
+    assert last_seen == {}
+
+    committed = FakeSession()
+    assert not server.is_repeat(committed, key, "Call", 0.0)
+    server.record_seen(committed)
+    assert key in last_seen
+    assert server.is_repeat(FakeSession(), key, "Call", 0.5)